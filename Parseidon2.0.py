@@ -2,7 +2,9 @@ import easyocr
 from PIL import Image
 import numpy as np
 import csv
-from collections import defaultdict
+
+from name_index import NameIndex
+from row_grouping import group_by_row
 
 # === CONFIG ===
 IMAGE_PATH = "screenshot2.png"
@@ -34,27 +36,9 @@ NAME_CORRECTIONS = {
     "w33b": "w33b"
 }
 
-# === Full-table OCR Logic ===
-def group_by_row(easyocr_results, y_tol=28):
-    row_map = defaultdict(list)
-    for res in easyocr_results:
-        box, text, conf = res
-        y = (box[0][1] + box[2][1]) // 2
-        found = False
-        for key in row_map:
-            if abs(y - key) <= y_tol:
-                row_map[key].append((box, text, conf))
-                found = True
-                break
-        if not found:
-            row_map[y].append((box, text, conf))
-    rows = []
-    for key in sorted(row_map.keys()):
-        row_items = row_map[key]
-        row_items.sort(key=lambda x: x[0][0][0])
-        rows.append([text for _, text, _ in row_items])
-    return rows
+NAME_INDEX = NameIndex(EXPECTED_NAMES, NAME_CORRECTIONS)
 
+# === Full-table OCR Logic ===
 def find_stat_header_row(rows):
     headers_lower = [h.lower() for h in STAT_HEADERS[1:-2] + ["Score"]]  # skip "Name", include "Score"
     best_idx = -1
@@ -78,19 +62,8 @@ def find_stat_header_row(rows):
         return -1, {}
 
 def fix_name(raw):
-    raw = raw.strip()
-    # Use corrections
-    if raw in NAME_CORRECTIONS:
-        return NAME_CORRECTIONS[raw]
-    # Fuzzy fallback: best match if similarity > 0.5
-    best = None
-    best_ratio = 0.0
-    for name in EXPECTED_NAMES:
-        r = sum(1 for a, b in zip(raw.lower(), name.lower()) if a == b) / max(len(name), 1)
-        if r > best_ratio:
-            best_ratio = r
-            best = name
-    return best if best_ratio > 0.5 else raw
+    # Exact NAME_CORRECTIONS hit first, then the closest roster name by edit distance
+    return NAME_INDEX.match(raw)
 
 def parse_team_rows_smart(rows):
     header_row_idx, stat_indexes = find_stat_header_row(rows)
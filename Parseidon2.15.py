@@ -1,73 +1,139 @@
 import os
-import cv2
-import pytesseract
+import argparse
 import csv
 
-BASE_Y = 156
-ROW_HEIGHT = 46
-NUM_ROWS = 10
-NUM_COLS = 7
-CROP_TOP_PAD = 6
-CROP_BOTTOM_PAD = 4
-
-# (x0, x1) for each column, hand-tuned
-COL_X = {
-    1: (80, 285),      # Name (wider)
-    2: (292, 328),     # Goal
-    3: (339, 375),     # Assist
-    4: (388, 427),     # Pass
-    5: (440, 510),     # Interception
-    6: (525, 600),     # Save
-    7: (1060, 1130),   # Score
-}
+from cell_grid import DEFAULT_GRID, NUM_COLS, NUM_ROWS, get_crop_box
+from debug_sink import DEBUG_FORMATS, DEBUG_SAMPLING, DebugSink
+from layout_detect import LayoutCache, fit_table_grid
+from ocr_cache import CropCache
+from preprocess import PreprocessedFrame, bounding_region
+from tesseract_backend import (BACKENDS, DIGIT_WHITELIST, NAME_WHITELIST, get_backend,
+                               split_words_by_slot, stack_crops)
 
 INPUT_IMAGE = "scoreboard.png"
 DEBUG_DIR = "debug_crops"
-os.makedirs(DEBUG_DIR, exist_ok=True)
+CROP_CACHE = CropCache()
 
-def get_crop_box(row, col):
-    y0 = BASE_Y + (row - 1) * ROW_HEIGHT + CROP_TOP_PAD
-    y1 = BASE_Y + (row - 1) * ROW_HEIGHT + ROW_HEIGHT - CROP_BOTTOM_PAD
-    x0, x1 = COL_X[col]
-    return int(x0), int(y0), int(x1), int(y1)
+def detect_grid(img, layout_cache):
+    # Grid from the layout detected for this resolution, falling back to the hand-tuned one
+    layout = layout_cache.get(img)
+    grid = fit_table_grid(layout, NUM_ROWS, NUM_COLS)
+    if grid is None:
+        if len(layout.cols) < NUM_COLS:
+            reason = f"only {len(layout.cols)} columns detected, expected {NUM_COLS}"
+        elif len(layout.rows) < NUM_ROWS:
+            reason = f"only {len(layout.rows)} table rows detected, expected {NUM_ROWS}"
+        else:
+            reason = (f"the {len(layout.rows)} detected rows are not evenly spaced, as one run of {NUM_ROWS} "
+                      f"or as two teams of {NUM_ROWS // 2}")
+        print(f"[WARN] No grid fits at {layout.width}x{layout.height}: {reason}. Using hand-tuned grid.")
+        return DEFAULT_GRID
+    print(f"[Layout] BASE_Y={grid.base_y} ROW_HEIGHT={grid.row_height} TEAM_GAP={grid.team_gap} COL_X={grid.col_x}")
+    return grid
 
-def ocr_image(image, col):
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    # For stats, up contrast & use adaptive threshold
+def preprocess_cell(frame, box, col):
+    # Returns (thresholded view, tesseract whitelist) for a cell in the given column
     if col == 1:
-        # Name: allow letters, numbers, _, space
-        config = '--psm 7 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_ '
-        _, thresh = cv2.threshold(gray, 140, 255, cv2.THRESH_BINARY)
-    else:
-        # Stat: only digits, stricter threshold, dilate to connect lines
-        config = '--psm 7 -c tessedit_char_whitelist=0123456789'
-        _, thresh = cv2.threshold(gray, 160, 255, cv2.THRESH_BINARY)
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2,2))
-        thresh = cv2.dilate(thresh, kernel, iterations=1)
-    return pytesseract.image_to_string(thresh, config=config).strip()
-
-def main():
-    print("\n--- Parseidon 2.15: Tuned for Your Screenshot ---\n")
-    img = cv2.imread(INPUT_IMAGE)
-    if img is None:
-        print(f"Error: Couldn't find '{INPUT_IMAGE}'!")
-        return
+        # Name: allow letters, numbers, _, space; threshold 140
+        return frame.name_cell(box), NAME_WHITELIST
+    # Stat: only digits, stricter threshold 160, dilated to connect lines
+    return frame.stat_cell(box), DIGIT_WHITELIST
 
-    parsed_rows = []
+def ocr_image(thresh, whitelist, backend):
+    # Keyed on the thresholded pixels, so repeated "0" cells skip recognition entirely
+    return CROP_CACHE.fetch(thresh, lambda: backend.recognize(thresh, whitelist), tag=whitelist)
+
+def is_failing_cell(text, col):
+    # Empty reads, and stat cells that are not a plain number
+    return not text or (col != 1 and not text.isdigit())
+
+def table_region(grid):
+    return bounding_region(get_crop_box(row, col, grid)
+                           for row in range(1, NUM_ROWS + 1) for col in range(1, NUM_COLS + 1))
 
+def ocr_by_cell(img, frame, backend, grid=DEFAULT_GRID, debug=None, screenshot_id=""):
+    # One OCR call per (row, col): NUM_ROWS x NUM_COLS calls per screenshot
+    parsed_rows = []
     for row in range(1, NUM_ROWS + 1):
         parsed_row = []
         print(f"[ROW {row}] ", end="")
         for col in range(1, NUM_COLS + 1):
-            x0, y0, x1, y1 = get_crop_box(row, col)
-            crop = img[y0:y1, x0:x1]
-            debug_path = f"{DEBUG_DIR}/debug_row{row}_col{col}.png"
-            cv2.imwrite(debug_path, crop)
-            text = ocr_image(crop, col)
+            box = get_crop_box(row, col, grid)
+            x0, y0, x1, y1 = box
+            text = ocr_image(*preprocess_cell(frame, box, col), backend)
+            if debug is not None:
+                debug.add(screenshot_id, f"debug_row{row}_col{col}", img[y0:y1, x0:x1],
+                          failing=is_failing_cell(text, col))
             print(f"[Col {col}: '{text}'] ", end="")
             parsed_row.append(text)
         print()
         parsed_rows.append(parsed_row)
+    return parsed_rows
+
+def ocr_by_column(frame, backend, grid=DEFAULT_GRID, debug=None, screenshot_id=""):
+    """
+    One OCR call per column: the column's preprocessed cells are stacked into a
+    composite with blank separators, and each word is routed back to its row by
+    its position in the composite.
+    """
+    columns = []
+    for col in range(1, NUM_COLS + 1):
+        cells = []
+        for row in range(1, NUM_ROWS + 1):
+            thresh, whitelist = preprocess_cell(frame, get_crop_box(row, col, grid), col)
+            cells.append(thresh)
+        composite, slot_height = stack_crops(cells)
+        words = backend.recognize_words(composite, whitelist)
+        texts = split_words_by_slot(words, NUM_ROWS, slot_height)
+        if debug is not None:
+            debug.add(screenshot_id, f"debug_col{col}", composite,
+                      failing=any(is_failing_cell(t, col) for t in texts))
+        print(f"[COL {col}] {texts}")
+        columns.append(texts)
+    return [list(row) for row in zip(*columns)]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Parseidon 2.15: per-cell Tesseract OCR")
+    parser.add_argument("--ocr-backend", choices=sorted(BACKENDS), default="pytesseract",
+                        help="pytesseract forks tesseract per cell; tesserocr keeps one engine in-process")
+    parser.add_argument("--mode", choices=["cell", "column"], default="cell",
+                        help="cell: one OCR call per cell (70); column: one call per stacked column (7)")
+    parser.add_argument("--auto-layout", action="store_true",
+                        help="Detect BASE_Y/ROW_HEIGHT/COL_X from the screenshot instead of the hand-tuned values")
+    parser.add_argument("--layout-cache", help="JSON file to persist detected layouts per resolution")
+    parser.add_argument("--debug-crops", choices=DEBUG_SAMPLING, default="off",
+                        help="Save crops in the background: all of them, or only cells that failed to read")
+    parser.add_argument("--debug-format", choices=DEBUG_FORMATS, default="zip",
+                        help="One zip or npz archive per screenshot, or a folder of PNGs")
+    parser.add_argument("--debug-dir", default=DEBUG_DIR)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("\n--- Parseidon 2.15: Tuned for Your Screenshot ---\n")
+    import cv2
+    img = cv2.imread(INPUT_IMAGE)
+    if img is None:
+        print(f"Error: Couldn't find '{INPUT_IMAGE}'!")
+        return
+    try:
+        backend = get_backend(args.ocr_backend)
+    except ImportError as e:
+        print(f"Error: {e}")
+        return
+
+    grid = detect_grid(img, LayoutCache(args.layout_cache)) if args.auto_layout else DEFAULT_GRID
+    # Grayscale, thresholds and dilation run once over the table; cells are views into it
+    frame = PreprocessedFrame(img, table_region(grid))
+    debug = None
+    if args.debug_crops != "off":
+        debug = DebugSink(args.debug_dir, args.debug_format, args.debug_crops)
+    screenshot_id = os.path.splitext(os.path.basename(INPUT_IMAGE))[0]
+    if args.mode == "column":
+        parsed_rows = ocr_by_column(frame, backend, grid, debug, screenshot_id)
+    else:
+        parsed_rows = ocr_by_cell(img, frame, backend, grid, debug, screenshot_id)
+    backend.close()
 
     headers = ["Name", "Goal", "Assist", "Pass", "Interception", "Save", "Score"]
     print("\n=== Parsed Scoreboard ===")
@@ -84,7 +150,12 @@ def main():
     print("[CSV output written as 'parsed_scoreboard.csv']")
 
     print("\n[Summary] Rows found:", len(parsed_rows))
-    print(f"[Debug crops written to '{DEBUG_DIR}/']\n")
+    if args.mode == "cell":
+        print(f"[Crop cache] {CROP_CACHE.stats()}")
+    if debug is not None:
+        debug.close()
+        print(f"[{debug.written} debug crops written to '{args.debug_dir}/']")
+    print()
 
 if __name__ == "__main__":
     main()
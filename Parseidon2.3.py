@@ -1,13 +1,30 @@
-import easyocr
-from PIL import Image
-import numpy as np
+import argparse
 import csv
-from collections import defaultdict
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import instrumentation
+from batch_scheduler import DEFAULT_BATCH_SIZE, DEFAULT_MAX_WAIT, BatchScheduler, when_all
+from cell_recognizer import CELL_PAD, DIGIT_ALLOWLIST, layout_cells, recognize_cells
+from image_batch import collect_images, load_image
+from instrumentation import METRICS, debug, profiled
+from layout_detect import DEFAULT_DETECT_SCALE, LayoutCache, detect_layout, parse_scale, read_table
+from name_index import NameIndex, load_roster
+from ocr_cache import DEFAULT_MAX_MB, CropCache, OCRResultCache
+from output_sinks import open_sinks, read_column
+from row_grouping import group_boxes_by_row
+from scoreboard_rows import PlayerRow, parse_stat
+from watch_folder import DEFAULT_POLL_SECONDS, watch_folder
 
 # === CONFIGURATION ===
 
 IMAGE_PATH = "screenshot2.png"
 CSV_OUTPUT = "parsed_scoreboard.csv"
+# Watch mode appends to its own file, so it never meets a single-image CSV's header
+WATCH_CSV_OUTPUT = "parseidon_watch.csv"
 
 # <-- Edit for your league! -->
 EXPECTED_NAMES = [
@@ -34,27 +51,28 @@ NAME_CORRECTIONS = {
     # 'MidnightsDawn': 'Midnights Dawn'
 }
 
-# === OCR ROW GROUPING & PARSING ===
+# Rows starting with these are screen chrome or team totals, not players
+SKIP_ROW_KEYWORDS = ["total", "match", "victory", "progression", "ranking", "back"]
+# The team banners share a row with the stat header, in the name column
+TEAM_LABELS = ["home", "away"]
+
+NAME_INDEX = NameIndex(EXPECTED_NAMES, NAME_CORRECTIONS)
 
-def group_by_row(easyocr_results, y_tol=28):
-    row_map = defaultdict(list)
-    for res in easyocr_results:
-        box, text, conf = res
-        y = (box[0][1] + box[2][1]) // 2
-        found = False
-        for key in row_map:
-            if abs(y - key) <= y_tol:
-                row_map[key].append((box, text, conf))
-                found = True
-                break
-        if not found:
-            row_map[y].append((box, text, conf))
-    rows = []
-    for key in sorted(row_map.keys()):
-        row_items = row_map[key]
-        row_items.sort(key=lambda x: x[0][0][0])
-        rows.append([text for _, text, _ in row_items])
-    return rows
+# Everything that changes what readtext() returns; part of the OCR cache key
+FULL_TABLE_OCR_SETTINGS = {"langs": ["en"], "gpu": False, "detail": 1, "paragraph": False}
+
+# Full-table cells below this confidence (or missing) are re-read from a targeted crop
+LOW_CONFIDENCE = 0.5
+# More bad cells than this and one row-crop pass is cheaper than re-reading cell by cell
+MAX_CELL_REREADS = 12
+# Screenshots with cells queued at once in --recognize-only batch runs
+RECOGNIZE_WINDOW = 16
+# Cells from several screenshots share recognize() batches only on GPU: on CPU, EasyOCR runs
+# its model once per box anyway, so each screenshot's cells are sent as soon as they are queued
+SHARED_BATCHES = FULL_TABLE_OCR_SETTINGS["gpu"]
+KNOWN_LAYOUT_FIELDS = len(STAT_HEADERS) - 1  # name and stats; is_mvp comes from the tail cell
+
+# === OCR ROW GROUPING & PARSING ===
 
 def find_stat_header_row(rows):
     headers_lower = [h.lower() for h in STAT_HEADERS[1:-2] + ["Score"]]  # skip Name, include Score
@@ -62,7 +80,7 @@ def find_stat_header_row(rows):
     best_count = 0
     best_map = {}
     for idx, row in enumerate(rows):
-        row_lower = [x.lower() for x in row]
+        row_lower = [x.lower() for _, x, _ in row]
         stat_map = {}
         count = 0
         for h in headers_lower:
@@ -78,67 +96,301 @@ def find_stat_header_row(rows):
     else:
         return -1, {}
 
+def stat_column_spans(rows):
+    # {stat field index: (x0, x1)} from the header row: each column reaches halfway to its neighbours
+    header_row_idx, stat_map = find_stat_header_row(rows)
+    if header_row_idx == -1:
+        return {}
+    header = rows[header_row_idx]
+    fields = [h.lower() for h in STAT_HEADERS]
+    centers = sorted(((header[idx][0][0][0] + header[idx][0][1][0]) / 2, fields.index(h))
+                     for h, idx in stat_map.items())
+    spans = {}
+    for i, (center, field) in enumerate(centers):
+        left = (centers[i - 1][0] + center) / 2 if i > 0 else center - (centers[1][0] - center) / 2
+        if i + 1 < len(centers):
+            right = (center + centers[i + 1][0]) / 2
+        else:
+            right = center + (center - centers[i - 1][0]) / 2
+        spans[field] = (int(left), int(right))
+    return spans
+
+def assign_to_columns(cells, spans):
+    # {stat field: (box, text, conf)} by x position; pieces of one split number are joined
+    fields = {}
+    for box, text, conf in cells:
+        x = (box[0][0] + box[1][0]) / 2
+        field = min(spans, key=lambda f: 0 if spans[f][0] <= x < spans[f][1]
+                    else min(abs(x - spans[f][0]), abs(x - spans[f][1])))
+        if field in fields:
+            prev_box, prev_text, prev_conf = fields[field]
+            box = [prev_box[0], box[1], box[2], prev_box[3]]
+            text, conf = prev_text + text, min(prev_conf, conf)
+        fields[field] = (box, text, conf)
+    return fields
+
+def is_skipped_row(first_cell):
+    return any(s in first_cell.lower() for s in SKIP_ROW_KEYWORDS)
+
 def fix_name(raw):
-    raw = raw.strip()
-    if raw in NAME_CORRECTIONS:
-        return NAME_CORRECTIONS[raw]
-    best = None
-    best_ratio = 0.0
-    for name in EXPECTED_NAMES:
-        r = sum(1 for a, b in zip(raw.lower(), name.lower()) if a == b) / max(len(name), 1)
-        if r > best_ratio:
-            best_ratio = r
-            best = name
-    return best if best_ratio > 0.5 else raw
+    # Exact NAME_CORRECTIONS hit first, then the closest roster name by edit distance
+    return NAME_INDEX.match(raw)
 
 def parse_team_rows_smart(rows):
-    header_row_idx, stat_indexes = find_stat_header_row(rows)
+    # rows are lists of (box, text, conf) cells; returns a list of PlayerRow
+    with METRICS.timer("header_detect"):
+        header_row_idx, stat_indexes = find_stat_header_row(rows)
+        spans = stat_column_spans(rows)
     player_rows = []
     headers_lower = [h.lower() for h in STAT_HEADERS]
     if header_row_idx == -1 or not stat_indexes:
         print("[WARN] Stat header row not found (Full-table). Will parse by [name, score] only.")
         header_row_idx = 0
     for row in rows[header_row_idx+1:]:
-        cells = [x.strip() for x in row if x.strip()]
+        kept = [(box, x.strip(), conf) for box, x, conf in row if x.strip()]
+        boxes = [box for box, _, _ in kept]
+        cells = [x for _, x, _ in kept]
+        confs = [conf for _, _, conf in kept]
         if not cells or len(cells) < 2:
             continue
-        if any(s in cells[0].lower() for s in ["total", "match", "victory", "progression", "ranking", "back"]):
+        if is_skipped_row(cells[0]):
             continue
         is_mvp = False
         if cells and cells[-1].upper() == "MVP":
             is_mvp = True
             cells = cells[:-1]
         name = fix_name(cells[0])
+        if spans:
+            # Cells go to the header column above them, so a missing cell stays missing
+            # (and gets re-read) instead of shifting the stats after it
+            fields = assign_to_columns(kept[1:len(cells)], spans)
+            found = [fields.get(f, (None, "", None)) for f in range(1, len(STAT_HEADERS) - 1)]
+            player_row = PlayerRow.from_cells(name, [text for _, text, _ in found], is_mvp,
+                                              conf=[confs[0]] + [conf for _, _, conf in found],
+                                              boxes=[boxes[0]] + [box for box, _, _ in found])
+            debug(f"[DEBUG] Parsed player row: {player_row} (raw cells: {cells})")
+            player_rows.append(player_row)
+            continue
         stats = []
+        stat_confs = []
+        stat_boxes = []
         # Fill with stats if present, otherwise pad
         for i in range(1, len(STAT_HEADERS) - 2):  # -2: skip Name and is_mvp
             if i < len(cells):
                 stats.append(cells[i])
+                stat_confs.append(confs[i])
+                stat_boxes.append(boxes[i])
             else:
                 stats.append("0")  # pad with 0 if missing
+                stat_confs.append(None)
+                stat_boxes.append(None)
         # Score (always try to take last value)
         score = cells[-1] if len(cells) > 1 else "0"
-        player_row = [name] + stats + [score, is_mvp]
-        print(f"[DEBUG] Parsed player row: {player_row} (raw cells: {cells})")
+        last = len(cells) - 1
+        player_row = PlayerRow.from_cells(name, stats + [score], is_mvp,
+                                          conf=[confs[0]] + stat_confs + [confs[last]],
+                                          boxes=[boxes[0]] + stat_boxes + [boxes[last]])
+        debug(f"[DEBUG] Parsed player row: {player_row} (raw cells: {cells})")
         player_rows.append(player_row)
     return player_rows
 
+# === SELECTIVE CELL RE-OCR ===
+
+def cell_box(row, field, spans):
+    # Padded (x0, y0, x1, y1) to re-read one field, or None if its position is unknown.
+    # Slicing clips the far edges to the image, so only the near ones are clamped here
+    box = row.boxes[field]
+    if box is not None:
+        xs, ys = [p[0] for p in box], [p[1] for p in box]
+        x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+    elif field in spans:
+        # Missing stat: its header's column, at the height of the rest of the row
+        known = [p[1] for b in row.boxes if b is not None for p in b]
+        if not known:
+            return None
+        (x0, x1), y0, y1 = spans[field], min(known), max(known)
+    else:
+        return None
+    return (max(0, int(x0) - CELL_PAD), max(0, int(y0) - CELL_PAD), int(x1) + CELL_PAD, int(y1) + CELL_PAD)
+
+def cells_to_reread(player_rows):
+    # (row, field) for every name/stat that is missing, unreadable or low-confidence
+    targets = []
+    for row in player_rows:
+        for field, conf in enumerate(row.conf):
+            if row.field(field) in (None, "") or conf is None or conf < LOW_CONFIDENCE:
+                targets.append((row, field))
+    return targets
+
+def accept_reread(old_value, old_conf, value, conf):
+    """
+    Whether a re-read replaces the full-table value: it must parse, and it must be more
+    confident unless the old value did not parse (a confident misread like "O" has no
+    value to keep).
+
+    >>> accept_reread(None, 0.97, 7, 0.80)
+    True
+    >>> accept_reread(5, 0.97, 7, 0.80)
+    False
+    >>> accept_reread(5, 0.60, 7, 0.80)
+    True
+    >>> accept_reread(None, 0.40, None, 0.90)
+    False
+    """
+    if value in (None, ""):
+        return False
+    if old_value in (None, "") or old_conf is None:
+        return True
+    return conf > old_conf
+
+def reread_cells(image_path, targets, spans, reader=None):
+    """
+    One small readtext call per target cell (stats restricted to digits). A re-read
+    replaces the full-table value as accept_reread decides.
+    Returns the number of fields improved.
+    """
+    decoded = []
+    def load_crop(box):
+        # The screenshot is decoded on the first re-read that misses the OCR cache
+        if not decoded:
+            decoded.append(load_image(image_path))
+        x0, y0, x1, y1 = box
+        return decoded[0][y0:y1, x0:x1]
+    improved = 0
+    for row, field in targets:
+        box = cell_box(row, field, spans)
+        if box is None:
+            continue
+        allowlist = None if field == 0 else DIGIT_ALLOWLIST
+        with METRICS.timer("readtext_cell"):
+            results = read_cell(image_path, box, allowlist, load_crop, reader)
+        if not results:
+            continue
+        results = sorted(results, key=lambda r: r[0][0][0])
+        conf = min(float(c) for _, _, c in results)
+        if field == 0:
+            value = fix_name(" ".join(t for _, t, _ in results))
+        else:
+            value = parse_stat("".join(t for _, t, _ in results))
+        if not accept_reread(row.field(field), row.conf[field], value, conf):
+            continue
+        print(f"[Refine] {row.name} {STAT_HEADERS[field]}: {row.field(field)!r} -> {value!r} (conf={conf:.2f})")
+        row.set_field(field, value, conf)
+        improved += 1
+    METRICS.count("cells_reread", len(targets))
+    METRICS.count("cells_improved", improved)
+    return improved
+
+# === OCR MODEL ===
+
+_READER = None
+OCR_CACHE = None
+LAYOUT_CACHE = None
+# Detect text only inside the scoreboard tables, not across the menus and banners around them
+TABLE_ROI = True
+DETECT_SCALE = DEFAULT_DETECT_SCALE
+CROP_CACHE = CropCache()
+
+def get_reader():
+    # Model load is the slowest step, so one Reader is shared by every pass and image
+    global _READER
+    if _READER is None:
+        # Imported here: easyocr pulls in torch, seconds of startup a cached re-parse never needs
+        import easyocr
+        with METRICS.timer("reader_init"):
+            _READER = easyocr.Reader(['en'], gpu=False)
+    return _READER
+
+def configure(args):
+    # Applies run-wide options; also called in every pool worker
+    global OCR_CACHE, LAYOUT_CACHE, TABLE_ROI, DETECT_SCALE
+    instrumentation.configure(args)
+    TABLE_ROI = not args.full_frame
+    DETECT_SCALE = args.detect_scale
+    if args.roster:
+        NAME_INDEX.add_all(load_roster(args.roster))
+    if args.cache_dir:
+        OCR_CACHE = OCRResultCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    if args.auto_layout or args.recognize_only:
+        LAYOUT_CACHE = LayoutCache(args.layout_cache)
+
+def init_worker(torch_threads, args):
+    # Pool initializer: each worker pins its torch thread count and warms up its own Reader once
+    import torch
+    torch.set_num_threads(torch_threads)
+    configure(args)
+    get_reader()
+
+def read_full_table(image_path, reader=None):
+    # The Reader is only built on a cache miss, so fully cached re-parses never load the model
+    def compute():
+        img = load_image(image_path, "RGB")
+        return read_table(reader or get_reader(), img, TABLE_ROI, DETECT_SCALE)
+    if OCR_CACHE is None:
+        return compute()
+    settings = dict(FULL_TABLE_OCR_SETTINGS, roi=TABLE_ROI, detect_scale=DETECT_SCALE)
+    return OCR_CACHE.fetch(image_path, settings, compute)
+
+def read_cell(image_path, box, allowlist, load_crop, reader=None):
+    # One cell re-read. OCR_CACHE keys it on the screenshot and box, so a cached re-parse
+    # neither decodes the screenshot nor loads the model; identical crops within a run
+    # are read once via CROP_CACHE
+    def compute():
+        crop = load_crop(box)
+        return CROP_CACHE.fetch(
+            crop, lambda: (reader or get_reader()).readtext(crop, detail=1, paragraph=False, allowlist=allowlist),
+            tag=f"cell{allowlist is not None}")
+    if OCR_CACHE is None:
+        return compute()
+    return OCR_CACHE.fetch(image_path, dict(FULL_TABLE_OCR_SETTINGS, cell=box, allowlist=allowlist), compute)
+
 # === ROW CROPPING & OCR FALLBACK ===
 
+def row_geometry(image_path):
+    # Detected (row_coords, x_start, x_end), or the hand-tuned values. Rows are detected on
+    # this screenshot (the cached ones are the first screenshot's); columns come from the cache.
+    if LAYOUT_CACHE is None:
+        return ROW_COORDS, X_START, X_END
+    img = load_image(image_path)
+    with METRICS.timer("layout"):
+        layout = detect_layout(img)._replace(cols=LAYOUT_CACHE.get(img).cols)
+    if not layout.rows or not layout.cols:
+        print(f"[WARN] No table rows detected at {layout.width}x{layout.height}. Using ROW_COORDS.")
+        return ROW_COORDS, X_START, X_END
+    # Bands hug the glyphs; give the recognizer the same margin the hand-tuned rows have
+    row_coords = [(max(0, y0 - (y1 - y0) // 4), min(layout.height, y1 + (y1 - y0) // 4))
+                  for y0, y1 in layout.rows]
+    return row_coords, layout.cols[0][0], layout.cols[-1][1]
+
 def crop_rows(image_path, row_coords, x_start, x_end):
-    img = Image.open(image_path)
-    cropped_rows = []
-    for i, (y_start, y_end) in enumerate(row_coords):
-        crop_box = (x_start, y_start, x_end, y_end)
-        row_img = img.crop(crop_box)
-        cropped_rows.append(row_img)
-    return cropped_rows
-
-def ocr_rows(row_images):
-    reader = easyocr.Reader(['en'], gpu=False)
+    # Decode once; every row is a zero-copy numpy view that readtext takes as-is
+    img = load_image(image_path)
+    return [img[y_start:y_end, x_start:x_end] for y_start, y_end in row_coords]
+
+def read_row(image_path, box, load_crop, reader=None):
+    # One row-crop read, cached like read_cell: OCR_CACHE on the screenshot and row box
+    # across runs, CROP_CACHE for identical crops (across the whole batch) within a run
+    def compute():
+        crop = load_crop(box)
+        return CROP_CACHE.fetch(
+            crop, lambda: (reader or get_reader()).readtext(crop, detail=0, paragraph=True), tag="row")
+    if OCR_CACHE is None:
+        return compute()
+    return OCR_CACHE.fetch(image_path, dict(FULL_TABLE_OCR_SETTINGS, detail=0, paragraph=True, row=box), compute)
+
+def ocr_rows(image_path, row_coords, x_start, x_end, reader=None):
+    # The screenshot is cropped on the first row that misses the OCR cache, so a fully
+    # cached fallback neither decodes it nor loads the model
+    crops = {}
+    def load_crop(box):
+        if not crops:
+            boxes = [(x_start, y_start, x_end, y_end) for y_start, y_end in row_coords]
+            crops.update(zip(boxes, crop_rows(image_path, row_coords, x_start, x_end)))
+        return crops[box]
     results = []
-    for idx, row_img in enumerate(row_images):
-        ocr_result = reader.readtext(np.array(row_img), detail=0, paragraph=True)
+    for y_start, y_end in row_coords:
+        with METRICS.timer("readtext_row"):
+            ocr_result = read_row(image_path, (x_start, y_start, x_end, y_end), load_crop, reader)
         if ocr_result:
             results.append(ocr_result[0])
         else:
@@ -154,74 +406,172 @@ def parse_row_text(row_text):
     while len(values) < len(STAT_HEADERS) - 1:
         values.append("0")
     values = values[:len(STAT_HEADERS) - 1]
-    return values + [is_mvp]
+    return PlayerRow.from_cells(values[0], values[1:], is_mvp)
 
 def print_rows_debug(rows, title):
+    if not instrumentation.DEBUG:
+        return
     print(f"\n[DEBUG] {title}:")
     for i, row in enumerate(rows):
         print(f"Row {i}: {row}")
 
 def output_csv(rows, csv_output):
-    with open(csv_output, "w", newline="", encoding="utf-8") as f:
+    with METRICS.timer("csv_write"), open(csv_output, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(STAT_HEADERS)
         for row in rows:
-            writer.writerow(row)
+            writer.writerow(row.cells())
     print(f"\n[CSV output written as '{csv_output}']")
 
-# === MAIN ===
+# === KNOWN-LAYOUT RECOGNITION ===
 
-def main():
-    print("\n--- Parseidon 2.3: Hybrid Table & Row OCR ---\n")
-    reader = easyocr.Reader(['en'], gpu=False)
-    results = reader.readtext(IMAGE_PATH, detail=1, paragraph=False)
-    print("\n[DEBUG] RAW OCR OUTPUT:")
-    for i, (box, text, conf) in enumerate(results):
-        print(f"{i}: '{text}' @ {box} (conf={conf:.2f})")
-    rows = group_by_row(results, y_tol=28)
-    print_rows_debug(rows, "Full-table OCR grouped rows (y_tol=28)")
-    team_rows = rows
-    player_rows = parse_team_rows_smart(team_rows)
+def cell_polygon(box):
+    x0, y0, x1, y1 = box
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1]]
 
-    num_stats = sum(1 for row in player_rows for v in row[1:-2] if v.isdigit())
-    enough_stats = num_stats >= EXPECTED_PLAYER_COUNT  # At least one stat per player
+def team_sizes(row_tops):
+    # (home, away) player counts: the Total match and AWAY rows leave the widest gap between the teams
+    if len(row_tops) < 2:
+        return len(row_tops), 0
+    gaps = [b - a for a, b in zip(row_tops, row_tops[1:])]
+    split = gaps.index(max(gaps)) + 1
+    return split, len(row_tops) - split
 
-    if player_rows and enough_stats:
+def submit_known_layout(image_path, scheduler):
+    """
+    Queues every cell of one screenshot on the BatchScheduler: names and MVP tails as
+    text, the rest under the digit allowlist. With SHARED_BATCHES the recognize() calls
+    are shared with whatever other screenshots are in flight; otherwise the cells are
+    flushed straight away. Returns [(cells, futures)] per row, or None if the detected
+    layout has too few columns for this mode.
+    Row bands are detected on every screenshot, since team sizes and the highlighted
+    MVP row move between matches; only the column geometry is cached per resolution.
+    """
+    import numpy as np
+    from PIL import Image
+    img = load_image(image_path, "RGB")
+    with METRICS.timer("layout"):
+        layout = detect_layout(img)._replace(cols=LAYOUT_CACHE.get(img).cols)
+    rows = layout_cells(layout, KNOWN_LAYOUT_FIELDS)
+    if not rows:
+        return None
+    gray = np.asarray(Image.fromarray(img).convert("L"))
+    table = []
+    for cells in rows:
+        futures = [scheduler.submit(gray[y0:y1, x0:x1], DIGIT_ALLOWLIST if 0 < i < KNOWN_LAYOUT_FIELDS else None)
+                   for i, (x0, y0, x1, y1) in enumerate(cells)]
+        table.append((cells, futures))
+    if not SHARED_BATCHES:
+        scheduler.flush()
+    return table
+
+def finish_known_layout(image_path, table, reader=None):
+    """
+    (player_rows, approach) from a submitted table, waiting for its cells; header and
+    team-banner rows are dropped by their name cell. A screenshot submit_known_layout
+    could not lay out, or whose two teams come out with different player counts (a
+    row band the layout pass missed), goes through parse_image instead.
+    """
+    if table is None:
+        print(f"[WARN] {image_path}: layout has too few columns for recognition-only mode.")
+        return parse_image(image_path, reader)
+    headers_lower = [h.lower() for h in STAT_HEADERS]
+    player_rows = []
+    for cells, futures in table:
+        reads = [future.result() for future in futures]
+        (name, name_conf), stats, (tail, _) = reads[0], reads[1:KNOWN_LAYOUT_FIELDS], reads[-1]
+        if not name or is_skipped_row(name) or name.lower() in headers_lower or name.lower() in TEAM_LABELS:
+            continue
+        player_row = PlayerRow.from_cells(fix_name(name), [text for text, _ in stats], "MVP" in tail.upper(),
+                                          conf=[name_conf] + [conf for _, conf in stats],
+                                          boxes=[cell_polygon(box) for box in cells[:KNOWN_LAYOUT_FIELDS]])
+        debug(f"[DEBUG] Recognized player row: {player_row}")
+        player_rows.append(player_row)
+    home, away = team_sizes([row.boxes[0][0][1] for row in player_rows])
+    if not player_rows or home != away:
+        print(f"[WARN] {image_path}: read {home}+{away} player rows, expected two teams of "
+              f"{max(home, away)}. Falling back to full-table OCR.")
+        return parse_image(image_path, reader)
+    METRICS.count("images")
+    METRICS.count("rows_parsed", len(player_rows))
+    return player_rows, "Known-layout recognition"
+
+def make_scheduler(args, reader=None):
+    # One recognize() call per batch of cells; see SHARED_BATCHES for when batches span screenshots
+    reader = reader or get_reader()
+    return BatchScheduler(lambda allowlist, crops: recognize_cells(reader, crops, allowlist),
+                          args.batch_size, args.max_wait)
+
+# === PIPELINE ===
+
+def parse_image(image_path, reader=None):
+    """
+    Runs the full-table pass, then re-reads only its missing or low-confidence cells.
+    The row-crop pass is the fallback when the full table yields no player rows or
+    too many bad cells. Returns (player_rows, approach).
+    """
+    METRICS.count("images")
+    results = read_full_table(image_path, reader)
+    if instrumentation.DEBUG:
+        print("\n[DEBUG] RAW OCR OUTPUT:")
+        for i, (box, text, conf) in enumerate(results):
+            print(f"{i}: '{text}' @ {box} (conf={conf:.2f})")
+    with METRICS.timer("group_rows"):
+        rows = group_boxes_by_row(results, y_tol=28)
+    print_rows_debug([[text for _, text, _ in row] for row in rows], "Full-table OCR grouped rows (y_tol=28)")
+    team_rows = rows
+    with METRICS.timer("parse_rows"):
+        player_rows = parse_team_rows_smart(team_rows)
+
+    targets = cells_to_reread(player_rows)
+    if player_rows and len(targets) <= MAX_CELL_REREADS:
+        if targets:
+            print(f"\n[Refine] Re-reading {len(targets)} low-confidence or missing cells...")
+            improved = reread_cells(image_path, targets, stat_column_spans(team_rows), reader)
+            print(f"[Refine] {improved}/{len(targets)} cells improved.")
         print("\nParsed player rows:")
         for row in player_rows:
             print(row)
-        output_csv(player_rows, CSV_OUTPUT)
+        METRICS.count("rows_parsed", len(player_rows))
+        return player_rows, "Full-table OCR"
+
+    print(f"\n[Full-table OCR] {len(targets)} bad cells in {len(player_rows)} rows. "
+          f"Falling back to Row Crop OCR...")
+    METRICS.count("row_crop_fallbacks")
+    row_coords, x_start, x_end = row_geometry(image_path)
+    print(f"Reading {len(row_coords)} player rows.")
+    ocr_results = ocr_rows(image_path, row_coords, x_start, x_end, reader)
+    player_rows = [parse_row_text(t) for t in ocr_results]
+    if LAYOUT_CACHE is not None:
+        # Detected bands also cover header and total rows; drop them by their first word
+        headers_lower = [h.lower() for h in STAT_HEADERS]
+        player_rows = [r for r in player_rows
+                       if r.name and not is_skipped_row(r.name) and r.name.lower() not in headers_lower]
+    print("\nParsed rows (Row Crop OCR):")
+    for row in player_rows:
+        print(row)
+    METRICS.count("rows_parsed", len(player_rows))
+    return player_rows, "Row-crop OCR"
+
+def print_summary(player_rows, approach):
+    if approach == "Full-table OCR":
         print(f"[Summary] Approach: Full-table OCR. Rows found: {len(player_rows)}")
+    elif approach == "Known-layout recognition":
+        print(f"[Summary] Approach: Known-layout recognition (no text detection). Rows found: {len(player_rows)}")
     else:
-        print(f"\n[Full-table OCR] Incomplete stats detected. Falling back to Row Crop OCR...")
-        # Row crop fallback
-        row_images = crop_rows(IMAGE_PATH, ROW_COORDS, X_START, X_END)
-        print(f"Cropped {len(row_images)} player rows.")
-        ocr_results = ocr_rows(row_images)
-        player_rows = [parse_row_text(t) for t in ocr_results]
-        print("\nParsed rows (Row Crop OCR):")
-        for row in player_rows:
-            print(row)
-        output_csv(player_rows, CSV_OUTPUT)
         print(f"[Summary] Approach: Row-crop OCR. Rows found and cropped: {len(player_rows)}")
 
-    # === ACCURACY ANALYSIS ===
+def print_accuracy_report(player_rows):
     expected_names_set = set(n.lower() for n in EXPECTED_NAMES)
-    detected_names_set = set(row[0].lower() for row in player_rows)
+    detected_names_set = set(row.name.lower() for row in player_rows)
     players_detected = len(detected_names_set & expected_names_set)
     player_accuracy = players_detected / len(expected_names_set) * 100 if expected_names_set else 0
 
-    fully_filled_rows = sum(
-        all(str(cell).isdigit() or str(cell) == "0" for cell in row[1:-2])  # skip name, skip is_mvp
-        for row in player_rows
-    )
+    fully_filled_rows = sum(row.complete for row in player_rows)
     row_stat_accuracy = fully_filled_rows / len(expected_names_set) * 100 if expected_names_set else 0
 
     num_stat_fields = (len(STAT_HEADERS) - 2) * len(expected_names_set)  # exclude name & is_mvp
-    stats_filled = sum(
-        sum(str(cell).isdigit() or str(cell) == "0" for cell in row[1:-2])
-        for row in player_rows
-    )
+    stats_filled = sum(row.filled for row in player_rows)
     field_accuracy = stats_filled / num_stat_fields * 100 if num_stat_fields else 0
 
     print("\n--- Parseidon Accuracy Report ---")
@@ -229,5 +579,225 @@ def main():
     print(f"Rows with All Stats Filled: {fully_filled_rows}/{len(expected_names_set)} ({row_stat_accuracy:.1f}%)")
     print(f"Individual Stat Field Accuracy: {stats_filled}/{num_stat_fields} ({field_accuracy:.1f}%)")
 
+# === MAIN ===
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Parseidon 2.3: Hybrid Table & Row OCR")
+    parser.add_argument("images", nargs="*",
+                        help="Screenshots, directories or glob patterns (default: IMAGE_PATH)")
+    parser.add_argument("--csv", help=f"CSV output path (default: '{CSV_OUTPUT}', or '{WATCH_CSV_OUTPUT}' with --watch)")
+    parser.add_argument("--roster", help="Extra player names for name matching, one per line")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Parse screenshots in N processes, each with its own Reader")
+    parser.add_argument("--cache-dir", help="Cache raw full-table OCR results here, keyed by image content")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_MB,
+                        help="Evict least recently used cache entries beyond this size")
+    parser.add_argument("--full-frame", action="store_true",
+                        help="Run text detection on the whole screenshot instead of just the table region")
+    parser.add_argument("--detect-scale", type=parse_scale, default=DEFAULT_DETECT_SCALE,
+                        help="Downscale factor for text detection (recognition stays full resolution); "
+                             "'auto' picks it from the header text height (experimental), 1 disables it")
+    parser.add_argument("--auto-layout", action="store_true",
+                        help="Detect row-crop geometry per resolution instead of using ROW_COORDS/X_START/X_END")
+    parser.add_argument("--layout-cache", help="JSON file to persist detected layouts across runs")
+    parser.add_argument("--recognize-only", action="store_true",
+                        help="Skip text detection: read the cells of the detected layout with the recognizer "
+                             "alone, in batches shared across screenshots")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Most cells per recognize() call in --recognize-only mode")
+    parser.add_argument("--max-wait", type=float, default=DEFAULT_MAX_WAIT,
+                        help="Seconds a cell waits for a batch shared with other screenshots to fill (GPU "
+                             "Reader only; on CPU each screenshot's cells are sent as soon as they are queued)")
+    parser.add_argument("--sqlite", metavar="DB",
+                        help="Also append rows to this SQLite database (table player_rows)")
+    parser.add_argument("--parquet", metavar="DIR",
+                        help="Also append rows to a Parquet dataset in this directory")
+    parser.add_argument("--watch", metavar="DIR",
+                        help="Keep running: parse new screenshots dropped into DIR and append their rows to --csv")
+    parser.add_argument("--poll", type=float, default=DEFAULT_POLL_SECONDS,
+                        help="Seconds between folder scans in --watch mode")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.csv is None:
+        args.csv = WATCH_CSV_OUTPUT if args.watch else CSV_OUTPUT
+    return args
+
+def parse_image_measured(image_path):
+    # Pool task: the worker's metrics for this screenshot travel back with its rows. A failure
+    # comes back as its message, so one bad screenshot does not stop pool.map() for the rest.
+    try:
+        return parse_image(image_path), None, METRICS.drain()
+    except Exception as e:
+        return None, str(e), METRICS.drain()
+
+def report_failure(image_path, error, failed):
+    # Same message watch_folder prints; the batch carries on with the next screenshot
+    print(f"[WARN] Failed to parse {image_path}: {error}")
+    failed.append(image_path)
+
+def iter_parsed(image_paths, args, failed):
+    """
+    Yields (image_path, player_rows, approach) in input order, serially or from a process
+    pool. Screenshots that fail to parse are reported, added to failed and skipped.
+    """
+    if args.recognize_only:
+        # Up to RECOGNIZE_WINDOW screenshots are queued ahead of the one being yielded
+        scheduler = make_scheduler(args)
+        window = deque()
+
+        def finish(image_path, table):
+            print(f"\n=== {image_path} ===")
+            try:
+                return (image_path, *finish_known_layout(image_path, table))
+            except Exception as e:
+                report_failure(image_path, e, failed)
+
+        try:
+            for image_path in image_paths:
+                try:
+                    window.append((image_path, submit_known_layout(image_path, scheduler)))
+                except Exception as e:
+                    print(f"\n=== {image_path} ===")
+                    report_failure(image_path, e, failed)
+                if len(window) >= RECOGNIZE_WINDOW:
+                    parsed = finish(*window.popleft())
+                    if parsed is not None:
+                        yield parsed
+            scheduler.flush()
+            while window:
+                parsed = finish(*window.popleft())
+                if parsed is not None:
+                    yield parsed
+        finally:
+            scheduler.close()
+        return
+    if args.workers <= 1:
+        for image_path in image_paths:
+            print(f"\n=== {image_path} ===")
+            try:
+                player_rows, approach = parse_image(image_path)
+            except Exception as e:
+                report_failure(image_path, e, failed)
+                continue
+            yield image_path, player_rows, approach
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    torch_threads = max(1, (os.cpu_count() or 1) // args.workers)
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(torch_threads, args)) as pool:
+        # map() hands results back in submission order, so the CSV matches the serial path
+        for image_path, (parsed, error, worker_metrics) in zip(
+                image_paths, pool.map(parse_image_measured, image_paths)):
+            print(f"\n=== {image_path} ===")
+            METRICS.merge(worker_metrics)
+            if parsed is None:
+                report_failure(image_path, error, failed)
+                continue
+            yield (image_path, *parsed)
+
+def run_batch(image_paths, args):
+    # One Reader per process for the whole batch; rows are streamed to a single CSV keyed by source file
+    csv_output = args.csv
+    failed = []
+    with open_sinks(csv_output, ["Source"] + STAT_HEADERS, False, args.sqlite, args.parquet) as sink:
+        for image_path, player_rows, approach in iter_parsed(image_paths, args, failed):
+            with METRICS.timer("csv_write"):
+                sink.write_rows([image_path] + row.values() for row in player_rows)
+            print_summary(player_rows, approach)
+            print_accuracy_report(player_rows)
+            instrumentation.flush(args, source=image_path, approach=approach)
+    print(f"\n[CSV output written as '{csv_output}']")
+    print(f"[Summary] Batch: {len(image_paths)} screenshots, {sink.rows_written} rows.")
+    if failed:
+        print(f"[WARN] {len(failed)} screenshot(s) failed and have no rows: {', '.join(failed)}")
+    print_cache_stats()
+    # Non-zero exit status, so scripts and CI notice a batch with failed screenshots
+    return 1 if failed else 0
+
+def run_watch(directory, args):
+    # Daemon mode: one warm Reader, rows appended to the CSV as each screenshot lands.
+    # Screenshots already listed in the CSV are not parsed again after a restart.
+    header = ["Source"] + STAT_HEADERS
+    done = read_column(args.csv, "Source")
+    try:
+        # Opened before the model loads, so a CSV with other columns fails straight away
+        sink = open_sinks(args.csv, header, True, args.sqlite, args.parquet)
+    except ValueError as e:
+        print(f"Error: {e}. Pass --csv with a new file for watch mode.")
+        return 1
+    get_reader()
+    print(f"[Watch] Watching '{directory}' (CSV: '{args.csv}', {len(done)} screenshots already parsed). Ctrl+C to stop.")
+    scheduler = make_scheduler(args) if args.recognize_only else None
+    sink_lock = threading.Lock()
+    with sink:
+        def write(image_path, player_rows, approach, start):
+            # Called from the scheduler thread once a batched screenshot's cells are back
+            with sink_lock, METRICS.timer("csv_write"):
+                sink.write_rows([image_path] + row.values() for row in player_rows)
+                sink.flush()
+                print(f"\n=== {image_path} ===")
+                print_summary(player_rows, approach)
+                instrumentation.flush(args, source=image_path, approach=approach)
+                print(f"[Watch] {image_path}: {len(player_rows)} rows in {time.perf_counter() - start:.2f}s")
+
+        def handle(image_path):
+            start = time.perf_counter()
+            table = submit_known_layout(image_path, scheduler) if scheduler is not None else None
+            if table is None:
+                player_rows, approach = (finish_known_layout(image_path, table) if scheduler is not None
+                                         else parse_image(image_path))
+                write(image_path, player_rows, approach, start)
+                return
+            # Returns straight away; the rows are written when the last of its cells is recognized
+            when_all([f for _, futures in table for f in futures],
+                     lambda: write(image_path, *finish_known_layout(image_path, table), start))
+        try:
+            watch_folder(directory, handle, args.poll, skip=done)
+        except KeyboardInterrupt:
+            if scheduler is not None:
+                scheduler.close()
+            print(f"\n[Watch] Stopped. {sink.rows_written} rows appended to '{args.csv}'.")
+    print_cache_stats()
+
+def print_cache_stats():
+    if OCR_CACHE is not None:
+        print(f"[Cache] {OCR_CACHE.hits} hits, {OCR_CACHE.misses} misses ('{OCR_CACHE.cache_dir}')")
+    if CROP_CACHE.hits or CROP_CACHE.misses:
+        print(f"[Crop cache] {CROP_CACHE.stats()}")
+    print(f"[Timing] {METRICS.summary()}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure(args)
+    with profiled(args.profile):
+        return run(args)
+
+def run(args):
+    print("\n--- Parseidon 2.3: Hybrid Table & Row OCR ---\n")
+    if args.watch:
+        return run_watch(args.watch, args)
+    if args.images or args.sqlite or args.parquet:
+        # Columnar outputs are keyed by screenshot, so they always go through the batch path
+        image_paths = collect_images(args.images) if args.images else [IMAGE_PATH]
+        if not image_paths:
+            print(f"Error: No screenshots found in {args.images}!")
+            return 1
+        return run_batch(image_paths, args)
+
+    if args.recognize_only:
+        scheduler = make_scheduler(args)
+        table = submit_known_layout(IMAGE_PATH, scheduler)
+        scheduler.close()
+        player_rows, approach = finish_known_layout(IMAGE_PATH, table)
+    else:
+        player_rows, approach = parse_image(IMAGE_PATH)
+    output_csv(player_rows, args.csv)
+    print_summary(player_rows, approach)
+    print_cache_stats()
+    instrumentation.flush(args, source=IMAGE_PATH, approach=approach)
+
+    # === ACCURACY ANALYSIS ===
+    print_accuracy_report(player_rows)
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,6 +1,12 @@
+import argparse
 import csv
 from collections import Counter, defaultdict
 
+from cell_grid import DEFAULT_GRID, NUM_COLS, NUM_ROWS, get_crop_box
+from consensus_engine import DEFAULT_AGREEMENT, DEFAULT_VARIANTS, DEFAULT_WORKERS, ConsensusEngine
+from layout_detect import detect_layout, fit_table_grid
+from tesseract_backend import BACKENDS
+
 # --- Your correction dictionary here ---
 correction_dict = {
     "kurank": "kurank",
@@ -116,12 +122,9 @@ def parse_scoreboard(raw_rows):
             clean_rows.append(parsed)
     return clean_rows
 
-# --- MAIN SCRIPT STARTS HERE ---
-print("\n--- Parseidon 3.5: Consensus & Clean Output Edition ---\n")
-
-# Simulate your detected raw_rows (in production, your OCR process fills this)
+# Simulated raw_rows, used when no screenshot is given
 # Each "row" is a list of lists: one list per cell of candidate values
-raw_rows = [
+SAMPLE_RAW_ROWS = [
     # Example row: [name_candidates, goal_candidates, assist_candidates, pass_candidates, int_candidates, save_candidates, score_candidates]
     [["kurank", "kurank", "kunirk", "kurirk", "kaw", "kaw"], ["4", "4", "2", "2"], ["0", "0", "0", "0", "0", "0"], ["5", "5", "5", "5"], ["4", "4", "4", "4", "4", "4"], [], ["3840", "3840", "0"]],
     [["moRise", "moRise", "Pest", "Pest", "raha", "rach"], [], ["0", "0", "0", "0", "0", "0"], ["5", "5", "5", "5"], ["3", "3", "2", "2", "3", "3"], ["5", "3"], ["2780", "2780", "2780", "2780", "2780", "2780"]],
@@ -135,39 +138,96 @@ raw_rows = [
     [["Asselo", "Asselo", "Asscla", "Asscla", "oa", "oa"], [], ["0", "0", "0", "0", "0", "0"], ["1", "1", "1", "1", "1", "1", "1", "1"], ["0", "0"], [], ["750", "750", "750", "73"]],
 ]
 
-# Debug print all candidate values
-print("=== Debug Candidates ===")
-for idx, row in enumerate(raw_rows):
-    debug_candidates(row, idx)
-print("")
-
-# Parse all rows
-clean_rows = parse_scoreboard(raw_rows)
-
-# Print the cleaned scoreboard
-print("=== Parsed Scoreboard ===")
-print(f"{'Name':<15} {'Goal':<5} {'Assist':<7} {'Pass':<7} {'Interception':<13} {'Save':<7} {'Score':<7}")
-print("-" * 72)
-for row in clean_rows:
-    print_row(row)
-print("=" * 72)
-
-# Write CSV
-csv_filename = "parsed_scoreboard.csv"
-with open(csv_filename, "w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow(["Name", "Goal", "Assist", "Pass", "Interception", "Save", "Score"])
+# --- OCR candidates from a screenshot ---
+
+def collect_candidates(image_path, args):
+    """
+    Runs the consensus engine over every cell of the screenshot and returns raw_rows
+    in the shape parse_scoreboard expects, or None if the image can't be read.
+    """
+    # OpenCV is only needed to read a screenshot; the built-in sample candidates skip it
+    import cv2
+    img = cv2.imread(image_path)
+    if img is None:
+        print(f"Error: Couldn't find '{image_path}'!")
+        return None
+    grid = DEFAULT_GRID
+    if args.auto_layout:
+        grid = fit_table_grid(detect_layout(img), NUM_ROWS, NUM_COLS) or DEFAULT_GRID
+    cells = [((row, col), get_crop_box(row, col, grid), col != 1)
+             for row in range(1, NUM_ROWS + 1) for col in range(1, NUM_COLS + 1)]
+    variants = [v for v in DEFAULT_VARIANTS if v.engine in args.engines]
+    engine = ConsensusEngine(variants, args.agreement, workers=args.workers, tesseract_backend=args.ocr_backend)
+    try:
+        candidates = engine.read_cells(img, cells)
+    finally:
+        engine.close()
+    print(f"[Consensus] {engine.stats(len(cells))}")
+    return [[candidates[(row, col)] for col in range(1, NUM_COLS + 1)] for row in range(1, NUM_ROWS + 1)]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Parseidon 3.5: Consensus & Clean Output Edition")
+    parser.add_argument("image", nargs="?",
+                        help="Screenshot to read candidates from (default: the built-in sample candidates)")
+    parser.add_argument("--agreement", type=int, default=DEFAULT_AGREEMENT,
+                        help="Stop OCR passes on a cell once this many candidates agree")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parallel OCR passes")
+    parser.add_argument("--engines", nargs="+", choices=["tesseract", "easyocr"], default=["tesseract", "easyocr"],
+                        help="OCR engines the variants may use")
+    parser.add_argument("--ocr-backend", choices=sorted(BACKENDS), default="pytesseract",
+                        help="Tesseract binding for the tesseract variants")
+    parser.add_argument("--auto-layout", action="store_true",
+                        help="Detect the cell grid from the screenshot instead of the hand-tuned values")
+    return parser.parse_args(argv)
+
+# --- MAIN SCRIPT STARTS HERE ---
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("\n--- Parseidon 3.5: Consensus & Clean Output Edition ---\n")
+
+    raw_rows = SAMPLE_RAW_ROWS
+    if args.image:
+        raw_rows = collect_candidates(args.image, args)
+        if raw_rows is None:
+            return
+
+    # Debug print all candidate values
+    print("=== Debug Candidates ===")
+    for idx, row in enumerate(raw_rows):
+        debug_candidates(row, idx)
+    print("")
+
+    # Parse all rows
+    clean_rows = parse_scoreboard(raw_rows)
+
+    # Print the cleaned scoreboard
+    print("=== Parsed Scoreboard ===")
+    print(f"{'Name':<15} {'Goal':<5} {'Assist':<7} {'Pass':<7} {'Interception':<13} {'Save':<7} {'Score':<7}")
+    print("-" * 72)
     for row in clean_rows:
-        writer.writerow(row)
-print(f"[CSV output written as '{csv_filename}']")
-
-print("\n[Summary] Rows found:", len(clean_rows))
-print("[Debug candidates printed above for reference]")
-
-# Optionally, write debug CSV with all candidates (for your own dev work)
-with open("debug_candidates.csv", "w", newline="", encoding="utf-8") as f:
-    writer = csv.writer(f)
-    writer.writerow(["Name_candidates", "Goal_candidates", "Assist_candidates", "Pass_candidates", "Interception_candidates", "Save_candidates", "Score_candidates"])
-    for row in raw_rows:
-        writer.writerow(row)
-print("[Debug candidate output written as 'debug_candidates.csv']")
+        print_row(row)
+    print("=" * 72)
+
+    # Write CSV
+    csv_filename = "parsed_scoreboard.csv"
+    with open(csv_filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Goal", "Assist", "Pass", "Interception", "Save", "Score"])
+        for row in clean_rows:
+            writer.writerow(row)
+    print(f"[CSV output written as '{csv_filename}']")
+
+    print("\n[Summary] Rows found:", len(clean_rows))
+    print("[Debug candidates printed above for reference]")
+
+    # Optionally, write debug CSV with all candidates (for your own dev work)
+    with open("debug_candidates.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name_candidates", "Goal_candidates", "Assist_candidates", "Pass_candidates", "Interception_candidates", "Save_candidates", "Score_candidates"])
+        for row in raw_rows:
+            writer.writerow(row)
+    print("[Debug candidate output written as 'debug_candidates.csv']")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,27 @@
-import easyocr
 import re
+import argparse
 import csv
-from collections import defaultdict
+import sys
+import time
+
+import instrumentation
+from image_batch import collect_images, load_image
+from instrumentation import METRICS, profiled
+from layout_detect import DEFAULT_DETECT_SCALE, parse_scale, read_table
+from name_index import NameIndex, load_roster
+from ocr_cache import DEFAULT_MAX_MB, OCRResultCache
+from output_sinks import open_sinks, read_column
+from row_grouping import group_cells_by_row
+from score_constraints import correct_rows, is_consistent, total_row_value
+from scoreboard_rows import MatchResult, PlayerRow
+from watch_folder import DEFAULT_POLL_SECONDS, watch_folder
 
 IMAGE_PATH = "scoreboard_screenshot.png"
 CSV_OUTPUT = "parsed_scoreboard.csv"
+# Watch mode appends to its own file, so it never meets a single-image CSV's header
+WATCH_CSV_OUTPUT = "scoreboard_watch.csv"
 STAT_HEADERS = ["Goal", "Assist", "Pass", "Interception", "Save", "Score"]
+BATCH_HEADER = ["Source", "Team", "Name"] + STAT_HEADERS + ["is_mvp"]
 
 EXPECTED_NAMES = [
     "kurank", "moRise", "Blidibloda", "lil_Hege", "hello9",
@@ -22,72 +38,49 @@ NAME_CORRECTIONS = {
     # Add more OCR quirks as needed!
 }
 
+NAME_INDEX = NameIndex(EXPECTED_NAMES, NAME_CORRECTIONS)
+
+# Everything that changes what readtext() returns; part of the OCR cache key
+OCR_SETTINGS = {"langs": ["en"], "gpu": False, "detail": 1, "paragraph": False}
+
 def fix_name(raw):
-    raw = raw.strip()
-    if raw in NAME_CORRECTIONS:
-        return NAME_CORRECTIONS[raw]
-    # Fuzzy fallback: best match if similarity > 0.5
-    best = None
-    best_ratio = 0.0
-    for name in EXPECTED_NAMES:
-        r = sum(1 for a, b in zip(raw.lower(), name.lower()) if a == b) / max(len(name), 1)
-        if r > best_ratio:
-            best_ratio = r
-            best = name
-    return best if best_ratio > 0.5 else raw
+    # Exact NAME_CORRECTIONS hit first, then the closest roster name by edit distance
+    return NAME_INDEX.match(raw)
 
 def calc_score(row):
-    try:
-        G, A, P, I, S = (int(x) for x in row[1:6])
-    except Exception:
+    # Lower bound on the in-game score: it also rewards actions the scoreboard doesn't list
+    if not row.complete:
         return -999999
+    G, A, P, I, S = row.stats[:5]
     return G*1000 + A*500 + P*250 + I*250 + S*500
 
-def group_by_row(easyocr_results, y_tol=18):
-    # easyocr_results: list of (box, text, conf)
-    row_map = defaultdict(list)
-    for res in easyocr_results:
-        box, text, conf = res
-        y = (box[0][1] + box[2][1]) // 2
-        found = False
-        for key in row_map:
-            if abs(y - key) <= y_tol:
-                row_map[key].append((box, text, conf))
-                found = True
-                break
-        if not found:
-            row_map[y].append((box, text, conf))
-    rows = []
-    for key in sorted(row_map.keys()):
-        row_items = row_map[key]
-        row_items.sort(key=lambda x: x[0][0][0])
-        rows.append([text for _, text, _ in row_items])
-    return rows
-
 def parse_team_rows_by_column(rows):
     """
-    Finds the stat header row, then parses all player rows by column index.
-    Returns a list of [name, goal, assist, pass, interception, save, score, is_mvp]
+    Finds the stat header row, then parses all player rows by column index, and
+    repairs rows that break the scoring rule from their own numbers plus the team's
+    Total match. rows are lists of (text, conf) cells. Returns a list of PlayerRow.
     """
     stat_indexes = {}
     player_rows = []
+    row_cells = []
     header_found = False
     headers_lower = [h.lower() for h in STAT_HEADERS]
 
     # 1. Find the header row and map stat names to column indexes
     header_row_idx = -1
-    for i, row in enumerate(rows):
-        cells = [x.strip() for x in row if x.strip()]
-        row_lower = [x.lower() for x in cells]
-        header_hits = sum(h in row_lower for h in headers_lower)
-        if header_hits >= 3:
-            for h in STAT_HEADERS:
-                if h.lower() in row_lower:
-                    stat_indexes[h] = row_lower.index(h.lower())
-            score_index = stat_indexes.get("Score", len(cells) - 1)
-            header_found = True
-            header_row_idx = i
-            break
+    with METRICS.timer("header_detect"):
+        for i, row in enumerate(rows):
+            cells = [x.strip() for x, _ in row if x.strip()]
+            row_lower = [x.lower() for x in cells]
+            header_hits = sum(h in row_lower for h in headers_lower)
+            if header_hits >= 3:
+                for h in STAT_HEADERS:
+                    if h.lower() in row_lower:
+                        stat_indexes[h] = row_lower.index(h.lower())
+                score_index = stat_indexes.get("Score", len(cells) - 1)
+                header_found = True
+                header_row_idx = i
+                break
 
     if not header_found:
         print("[WARN] Stat header row not found!")
@@ -95,7 +88,8 @@ def parse_team_rows_by_column(rows):
 
     # 2. Parse all player rows (those after the header)
     for row in rows[header_row_idx+1:]:
-        cells = [x.strip() for x in row if x.strip()]
+        confs = [conf for x, conf in row if x.strip()]
+        cells = [x.strip() for x, _ in row if x.strip()]
         if not cells or len(cells) < 2:
             continue
         is_mvp = False
@@ -106,28 +100,38 @@ def parse_team_rows_by_column(rows):
             continue
         # Name is the first non-numeric, non-header cell
         name = None
+        name_conf = None
         for idx, val in enumerate(cells):
             if not val.replace(',', '').isdigit() and val.lower() not in headers_lower:
                 name = fix_name(val)
+                name_conf = confs[idx]
                 break
         if not name:
             continue  # No name found
-        # Collect stats by mapped index
+        # Collect stats by mapped index (the last is always "Score")
         stats = []
+        stat_confs = []
         for h in STAT_HEADERS:
             si = stat_indexes.get(h)
-            stat_val = cells[si] if (si is not None and si < len(cells)) else ""
-            stats.append(stat_val.replace(",", ""))
-        # Score (ensure it's the rightmost or mapped column)
-        score = stats[-1]  # last is always "Score" by mapping
-        player_rows.append([name] + stats[:-1] + [score, is_mvp])
+            found = si is not None and si < len(cells)
+            stats.append(cells[si] if found else "")
+            stat_confs.append(confs[si] if found else None)
+        player_rows.append(PlayerRow.from_cells(name, stats, is_mvp, conf=[name_conf] + stat_confs))
+        row_cells.append(list(zip(cells, confs))[idx + 1:])
+
+    with METRICS.timer("constraints"):
+        corrected = correct_rows(player_rows, row_cells, total_row_value(rows[header_row_idx+1:]))
+    METRICS.count("rows_parsed", len(player_rows))
+    METRICS.count("rows_corrected", corrected)
+    if corrected:
+        print(f"[Check] Re-placed {corrected} row(s) from the score rule and Total match")
     return player_rows
 
 def find_team_sections(rows):
     home_idx = None
     away_idx = None
     for i, row in enumerate(rows):
-        line = " ".join(row).lower()
+        line = " ".join(text for text, _ in row).lower()
         if "home" in line and home_idx is None:
             home_idx = i
         elif "away" in line and away_idx is None:
@@ -139,23 +143,69 @@ def find_team_sections(rows):
     away_rows = rows[away_idx+1:]
     return home_rows, away_rows
 
-def main():
-    print("\n--- Referee1.1 ---\n")
-    reader = easyocr.Reader(['en'], gpu=False)
-    results = reader.readtext(IMAGE_PATH, detail=1, paragraph=False)
-    rows = group_by_row(results)
+_READER = None
+OCR_CACHE = None
+# Detect text only inside the scoreboard tables, not across the menus and banners around them
+TABLE_ROI = True
+DETECT_SCALE = DEFAULT_DETECT_SCALE
 
-    print("\n[DEBUG] OCR grouped rows (by y):")
-    for i, row in enumerate(rows):
-        print(f"Row {i}: {row}")
+def get_reader():
+    # Built once and shared across every screenshot in a run
+    global _READER
+    if _READER is None:
+        # Imported here: easyocr pulls in torch, seconds of startup a cached re-parse never needs
+        import easyocr
+        with METRICS.timer("reader_init"):
+            _READER = easyocr.Reader(['en'], gpu=False)
+    return _READER
+
+def configure(args):
+    global OCR_CACHE, TABLE_ROI, DETECT_SCALE
+    instrumentation.configure(args)
+    TABLE_ROI = not args.full_frame
+    DETECT_SCALE = args.detect_scale
+    if args.roster:
+        NAME_INDEX.add_all(load_roster(args.roster))
+    if args.cache_dir:
+        OCR_CACHE = OCRResultCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+
+def read_scoreboard(image_path, reader=None):
+    # The Reader is only built on a cache miss, so fully cached re-parses never load the model
+    def compute():
+        img = load_image(image_path, "RGB")
+        return read_table(reader or get_reader(), img, TABLE_ROI, DETECT_SCALE)
+    if OCR_CACHE is None:
+        return compute()
+    return OCR_CACHE.fetch(image_path, dict(OCR_SETTINGS, roi=TABLE_ROI, detect_scale=DETECT_SCALE), compute)
+
+def parse_image(image_path, reader=None):
+    """
+    OCRs one screenshot (a path or encoded image bytes) and returns a MatchResult
+    with "HOME" and "AWAY" rows.
+    """
+    METRICS.count("images")
+    results = read_scoreboard(image_path, reader)
+    with METRICS.timer("group_rows"):
+        rows = group_cells_by_row(results, y_tol=18)
+
+    if instrumentation.DEBUG:
+        print("\n[DEBUG] OCR grouped rows (by y):")
+        for i, row in enumerate(rows):
+            print(f"Row {i}: {[text for text, _ in row]}")
 
-    home_rows, away_rows = find_team_sections(rows)
+    with METRICS.timer("parse_rows"):
+        home_rows, away_rows = find_team_sections(rows)
+        parsed = MatchResult({
+            "HOME": parse_team_rows_by_column(home_rows),
+            "AWAY": parse_team_rows_by_column(away_rows)
+        }, image_path if isinstance(image_path, str) else "")
+    return parsed
 
-    parsed = {
-        "HOME": parse_team_rows_by_column(home_rows),
-        "AWAY": parse_team_rows_by_column(away_rows)
-    }
+def csv_rows(parsed):
+    for row in parsed.rows():
+        yield [row.team] + row.values()
 
+def print_report(parsed):
     found_players = []
     valid_players = []
     statful_players = []
@@ -167,43 +217,27 @@ def main():
     print("-" * 85)
     for team in parsed:
         for row in parsed[team]:
-            name = row[0]
-            is_mvp = row[-1]
+            name = row.name
+            is_mvp = row.is_mvp
             found_players.append(name)
             if name in EXPECTED_NAMES:
                 valid_players.append(name)
-            stats = row[1:6]
-            stats_filled = all(s and s.isdigit() for s in stats)
-            if stats_filled:
+            if row.complete:
                 statful_players.append(name)
             else:
                 missing_stats_rows.append(name)
-            if stats_filled and row[-2].isdigit():
+            line = f"{team} | " + " | ".join(row.cells()[:-1]) + f" | {is_mvp}"
+            if row.complete and row.score is not None:
                 stat_calc = calc_score(row)
-                ocr_score = int(row[-2])
-                stat_match = stat_calc == ocr_score
+                stat_match = is_consistent(row.stats[:-1], row.score)
                 matched_stats += int(stat_match)
                 total_stats += 1
-                print(f"{team} | " + " | ".join(str(x) for x in row[:-1]) + f" | {is_mvp}" +
-                      ("" if stat_match else f"   [!] Score mismatch: calc={stat_calc}"))
+                print(line + ("" if stat_match else f"   [!] Stats exceed score: calc={stat_calc}"))
             else:
-                print(f"{team} | " + " | ".join(str(x) for x in row[:-1]) + f" | {is_mvp}")
+                print(line)
+    return valid_players, statful_players, missing_stats_rows
 
-    # Output to CSV
-    with open(CSV_OUTPUT, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Team", "Name"] + STAT_HEADERS + ["is_mvp"])
-        for team in parsed:
-            for row in parsed[team]:
-                output_row = [team] + row[:-1]
-                while len(output_row) < (2 + len(STAT_HEADERS)):
-                    output_row.insert(len(output_row) - 1, "")
-                output_row.append(row[-1])
-                writer.writerow(output_row)
-
-    print(f"\n[CSV output written as '{CSV_OUTPUT}']")
-
-    # Accuracy
+def print_summary(valid_players, statful_players, missing_stats_rows):
     player_detection_accuracy = (len(valid_players) / EXPECTED_PLAYER_COUNT) if EXPECTED_PLAYER_COUNT else 0
     stat_detection_accuracy = (len(statful_players) / EXPECTED_PLAYER_COUNT) if EXPECTED_PLAYER_COUNT else 0
 
@@ -220,5 +254,129 @@ def main():
         print(f"WARNING: Missing stat data for: {', '.join(missing_stats_rows)}")
         print("Try checking your screenshot quality or OCR grouping if this persists.")
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Referee1.1 scoreboard parser")
+    parser.add_argument("images", nargs="*",
+                        help="Screenshots, directories or glob patterns (default: IMAGE_PATH)")
+    parser.add_argument("--csv", help=f"CSV output path (default: '{CSV_OUTPUT}', or '{WATCH_CSV_OUTPUT}' with --watch)")
+    parser.add_argument("--roster", help="Extra player names for name matching, one per line")
+    parser.add_argument("--cache-dir", help="Cache raw OCR results here, keyed by image content")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_MB,
+                        help="Evict least recently used cache entries beyond this size")
+    parser.add_argument("--full-frame", action="store_true",
+                        help="Run text detection on the whole screenshot instead of just the table region")
+    parser.add_argument("--detect-scale", type=parse_scale, default=DEFAULT_DETECT_SCALE,
+                        help="Downscale factor for text detection (recognition stays full resolution); "
+                             "'auto' picks it from the header text height (experimental), 1 disables it")
+    parser.add_argument("--sqlite", metavar="DB",
+                        help="Also append rows to this SQLite database (table player_rows)")
+    parser.add_argument("--parquet", metavar="DIR",
+                        help="Also append rows to a Parquet dataset in this directory")
+    parser.add_argument("--watch", metavar="DIR",
+                        help="Keep running: parse new screenshots dropped into DIR and append their rows to --csv")
+    parser.add_argument("--poll", type=float, default=DEFAULT_POLL_SECONDS,
+                        help="Seconds between folder scans in --watch mode")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.csv is None:
+        args.csv = WATCH_CSV_OUTPUT if args.watch else CSV_OUTPUT
+    return args
+
+def print_cache_stats():
+    if OCR_CACHE is not None:
+        print(f"[Cache] {OCR_CACHE.hits} hits, {OCR_CACHE.misses} misses ('{OCR_CACHE.cache_dir}')")
+    print(f"[Timing] {METRICS.summary()}")
+
+def run_batch(image_paths, args):
+    # One Reader for the whole batch (built on the first cache miss); rows are streamed
+    # to a single CSV keyed by source file
+    csv_output = args.csv
+    failed = []
+    with open_sinks(csv_output, BATCH_HEADER, False, args.sqlite, args.parquet) as sink:
+        for image_path in image_paths:
+            print(f"\n=== {image_path} ===")
+            try:
+                parsed = parse_image(image_path)
+            except Exception as e:
+                # Same message watch_folder prints; the batch carries on with the next screenshot
+                print(f"[WARN] Failed to parse {image_path}: {e}")
+                failed.append(image_path)
+                continue
+            with METRICS.timer("csv_write"):
+                sink.write_rows([image_path] + output_row for output_row in csv_rows(parsed))
+            print_summary(*print_report(parsed))
+            instrumentation.flush(args, source=image_path)
+    print(f"\n[CSV output written as '{csv_output}']")
+    print(f"[Summary] Batch: {len(image_paths)} screenshots, {sink.rows_written} rows.")
+    if failed:
+        print(f"[WARN] {len(failed)} screenshot(s) failed and have no rows: {', '.join(failed)}")
+    print_cache_stats()
+    # Non-zero exit status, so scripts and CI notice a batch with failed screenshots
+    return 1 if failed else 0
+
+def run_watch(directory, args):
+    # Daemon mode: one warm Reader, rows appended to the CSV as each screenshot lands.
+    # Screenshots already listed in the CSV are not parsed again after a restart.
+    csv_output = args.csv
+    done = read_column(csv_output, "Source")
+    try:
+        # Opened before the model loads, so a CSV with other columns fails straight away
+        sink = open_sinks(csv_output, BATCH_HEADER, True, args.sqlite, args.parquet)
+    except ValueError as e:
+        print(f"Error: {e}. Pass --csv with a new file for watch mode.")
+        return 1
+    get_reader()
+    print(f"[Watch] Watching '{directory}' (CSV: '{csv_output}', {len(done)} screenshots already parsed). Ctrl+C to stop.")
+    with sink:
+        def handle(image_path):
+            start = time.perf_counter()
+            print(f"\n=== {image_path} ===")
+            parsed = parse_image(image_path)
+            with METRICS.timer("csv_write"):
+                sink.write_rows([image_path] + output_row for output_row in csv_rows(parsed))
+                sink.flush()
+            print_report(parsed)
+            instrumentation.flush(args, source=image_path)
+            print(f"[Watch] {image_path}: parsed in {time.perf_counter() - start:.2f}s")
+        try:
+            watch_folder(directory, handle, args.poll, skip=done)
+        except KeyboardInterrupt:
+            print(f"\n[Watch] Stopped. {sink.rows_written} rows appended to '{csv_output}'.")
+    print_cache_stats()
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure(args)
+    with profiled(args.profile):
+        return run(args)
+
+def run(args):
+    print("\n--- Referee1.1 ---\n")
+    if args.watch:
+        return run_watch(args.watch, args)
+    if args.images or args.sqlite or args.parquet:
+        # Columnar outputs are keyed by screenshot, so they always go through the batch path
+        image_paths = collect_images(args.images) if args.images else [IMAGE_PATH]
+        if not image_paths:
+            print(f"Error: No screenshots found in {args.images}!")
+            return 1
+        return run_batch(image_paths, args)
+
+    parsed = parse_image(IMAGE_PATH)
+    valid_players, statful_players, missing_stats_rows = print_report(parsed)
+
+    # Output to CSV
+    with METRICS.timer("csv_write"), open(args.csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Team", "Name"] + STAT_HEADERS + ["is_mvp"])
+        writer.writerows(csv_rows(parsed))
+
+    print(f"\n[CSV output written as '{args.csv}']")
+
+    # Accuracy
+    print_summary(valid_players, statful_players, missing_stats_rows)
+    print_cache_stats()
+    instrumentation.flush(args, source=IMAGE_PATH)
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import Scoreboard_parser
+from instrumentation import METRICS
+from layout_detect import DEFAULT_DETECT_SCALE, parse_scale
+from ocr_cache import DEFAULT_MAX_MB
+
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_PENDING = 8
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+_local = threading.local()
+
+class ParserBusy(Exception):
+    pass
+
+def _thread_reader():
+    # Each executor thread gets its own warm Reader; one Reader is not shared across threads
+    if getattr(_local, "reader", None) is None:
+        import easyocr
+        settings = Scoreboard_parser.OCR_SETTINGS
+        with METRICS.timer("reader_init"):
+            _local.reader = easyocr.Reader(settings["langs"], gpu=settings["gpu"])
+    return _local.reader
+
+def _parse(image_bytes):
+    return Scoreboard_parser.parse_image(image_bytes, _thread_reader())
+
+class AsyncScoreboardParser:
+    """
+    Runs the blocking OCR pipeline in a bounded thread pool so the event loop stays free.
+    At most max_pending jobs are queued or running; further callers wait for a slot, or
+    get ParserBusy straight away with block=False. A slot is only freed once its OCR job
+    has really stopped, so timed-out or cancelled requests cannot pile up work behind
+    the scenes (jobs that have not started yet are dropped from the pool).
+    The whole Scoreboard_parser.parse_image call runs in the pool, so nothing blocks
+    the loop; the tesseract pipeline (Parseidon 2.15) is not served here. One parser
+    can be used from successive event loops (each asyncio.run gets its own slots).
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr",
+                                            initializer=_thread_reader)
+        self.max_pending = max_pending
+        self._loop = None
+        self._slots = None
+
+    def _loop_slots(self, loop):
+        # A Semaphore binds to the first loop that waits on it, so each loop gets its own
+        if self._loop is not loop:
+            self._loop, self._slots = loop, asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def parse(self, image_bytes, timeout=None, block=True):
+        """
+        Returns the MatchResult (HOME/AWAY PlayerRows) that Scoreboard_parser.parse_image builds.
+        Raises asyncio.TimeoutError after timeout seconds and ParserBusy when the queue
+        is full and block is False.
+        """
+        loop = asyncio.get_running_loop()
+        slots = self._loop_slots(loop)
+        # The timeout covers both waiting for a slot and the OCR itself
+        deadline = None if timeout is None else loop.time() + timeout
+        if not block:
+            if slots.locked():
+                raise ParserBusy("OCR queue is full")
+            # Awaited directly: a free slot is taken without yielding to another caller
+            await slots.acquire()
+        else:
+            await asyncio.wait_for(slots.acquire(), timeout)
+        try:
+            job = self._executor.submit(_parse, image_bytes)
+        except BaseException:
+            slots.release()
+            raise
+
+        def release(_):
+            # A job can outlive its loop (asyncio.run returned); its slots went with it
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(slots.release)
+        job.add_done_callback(release)
+        try:
+            remaining = None if deadline is None else max(0, deadline - loop.time())
+            return await asyncio.wait_for(asyncio.wrap_future(job), remaining)
+        finally:
+            job.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_DEFAULT_PARSER = None
+
+async def parse_scoreboard_async(image_bytes, timeout=None):
+    # Module-level shortcut backed by one shared parser with the default limits
+    global _DEFAULT_PARSER
+    if _DEFAULT_PARSER is None:
+        _DEFAULT_PARSER = AsyncScoreboardParser()
+    return await _DEFAULT_PARSER.parse(image_bytes, timeout)
+
+# === LOCAL HTTP STAND-IN ===
+
+async def _respond(writer, status, payload, content_type="application/json"):
+    body = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+    writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    writer.close()
+
+def make_handler(parser, timeout):
+    # POST /parse with the raw screenshot as the body; answers with the parsed rows as JSON.
+    # GET /metrics serves the stage timings and counters in Prometheus text format.
+    async def handle(reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+            if request_line[:2] == ["GET", "/metrics"]:
+                return await _respond(writer, "200 OK", METRICS.to_prometheus(),
+                                      "text/plain; version=0.0.4")
+            if request_line[:2] != ["POST", "/parse"]:
+                return await _respond(writer, "404 Not Found", {"error": "POST /parse"})
+            length = int(headers.get("content-length", 0))
+            if not 0 < length <= MAX_BODY_BYTES:
+                return await _respond(writer, "400 Bad Request", {"error": "missing or oversized body"})
+            image_bytes = await reader.readexactly(length)
+            parsed = await parser.parse(image_bytes, timeout, block=False)
+            await _respond(writer, "200 OK", parsed.to_dict())
+        except ParserBusy as e:
+            await _respond(writer, "503 Service Unavailable", {"error": str(e)})
+        except asyncio.TimeoutError:
+            await _respond(writer, "504 Gateway Timeout", {"error": f"OCR took longer than {timeout}s"})
+        except (ValueError, IndexError, asyncio.IncompleteReadError) as e:
+            await _respond(writer, "400 Bad Request", {"error": str(e)})
+        except Exception as e:
+            print(f"[WARN] Request failed: {e}")
+            await _respond(writer, "500 Internal Server Error", {"error": str(e)})
+    return handle
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP stand-in for the async scoreboard API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="OCR threads, each with its own Reader")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help="Queued + running jobs before requests are refused with 503")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request OCR timeout in seconds")
+    parser.add_argument("--roster", help="Extra player names for name matching, one per line")
+    parser.add_argument("--cache-dir", help="Cache raw OCR results here, keyed by image content")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_MB)
+    parser.add_argument("--full-frame", action="store_true",
+                        help="Run text detection on the whole screenshot instead of just the table region")
+    parser.add_argument("--detect-scale", type=parse_scale, default=DEFAULT_DETECT_SCALE,
+                        help="Downscale factor for text detection (recognition stays full resolution); "
+                             "'auto' picks it from the header text height (experimental), 1 disables it")
+    return parser.parse_args(argv)
+
+async def serve(args):
+    Scoreboard_parser.configure(args)
+    parser = AsyncScoreboardParser(args.workers, args.max_pending)
+    server = await asyncio.start_server(make_handler(parser, args.timeout), args.host, args.port)
+    print(f"[Serve] POST screenshots to http://{args.host}:{args.port}/parse")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        parser.close()
+
+def main(argv=None):
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import Future
+
+from instrumentation import METRICS
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT = 0.05  # seconds
+
+class BatchScheduler:
+    """
+    Collects recognition jobs (crops, from any number of screenshots) into batches and
+    runs each batch with one run_batch(key, items) call, which returns one result per
+    item in order. Jobs are grouped by key (an allowlist or whitelist: one call runs with
+    one set of options). A group goes out as soon as it holds batch_size jobs, or when
+    its oldest job has waited max_wait seconds, so a lone screenshot in daemon mode is
+    not held back for a full batch. submit() returns a Future for the job's result.
+    """
+
+    def __init__(self, run_batch, batch_size=DEFAULT_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT):
+        self.run_batch = run_batch
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self._pending = {}  # key -> [(item, future, enqueued_at)]
+        self._flush = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="batch-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, item, key=None):
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchScheduler is closed")
+            self._pending.setdefault(key, []).append((item, future, time.monotonic()))
+            self._cond.notify()
+        return future
+
+    def flush(self):
+        # Sends every pending job now instead of waiting for full batches (end of input)
+        with self._cond:
+            self._flush = True
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = self._flush = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _next_batch(self):
+        # (key, jobs, None) for a batch ready to run, else (None, None, seconds to wait)
+        now = time.monotonic()
+        wait = None
+        for key, jobs in self._pending.items():
+            deadline = jobs[0][2] + self.max_wait
+            if len(jobs) >= self.batch_size or self._flush or deadline <= now:
+                batch = jobs[:self.batch_size]
+                del jobs[:self.batch_size]
+                if not jobs:
+                    del self._pending[key]
+                return key, batch, None
+            wait = deadline - now if wait is None else min(wait, deadline - now)
+        return None, None, wait
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    key, batch, wait = self._next_batch()
+                    if batch is not None:
+                        break
+                    if not self._pending:
+                        self._flush = False
+                        if self._closed:
+                            return
+                    self._cond.wait(wait)
+            self._execute(key, batch)
+
+    def _execute(self, key, batch):
+        METRICS.count("recognition_batches")
+        METRICS.count("recognition_batch_items", len(batch))
+        self.batches += 1
+        try:
+            results = self.run_batch(key, [item for item, _, _ in batch])
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+def when_all(futures, callback):
+    """
+    Calls callback() once, from whichever thread completes the last of futures; how a
+    daemon hands a screenshot's rows on once every one of its cells is back.
+    """
+    futures = list(futures)
+    remaining = [len(futures)]
+    lock = threading.Lock()
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            callback()
+    if not futures:
+        callback()
+    for future in futures:
+        future.add_done_callback(done)
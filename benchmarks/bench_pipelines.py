@@ -0,0 +1,276 @@
+import argparse
+import contextlib
+import csv
+import importlib.util
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+GOLDEN_DIR = os.path.join(BENCH_DIR, "golden")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+STAT_FIELDS = ["Goal", "Assist", "Pass", "Interception", "Save", "Score"]
+
+# Script per pipeline, and which of its module-level functions make up each stage.
+# EasyOCR Reader construction is always "model_load" and readtext() is always "ocr";
+# time not spent in any listed function is reported as "other".
+PIPELINES = {
+    "2.0": ("Parseidon2.0.py", {"group_by_row": "grouping", "parse_team_rows_smart": "parsing",
+                                "crop_rows": "crop", "parse_row_text": "parsing", "output_csv": "output"}),
+    "2.2": ("Parseidon2.2.py", {"group_by_row": "grouping", "parse_team_rows_smart": "parsing",
+                                "crop_rows": "crop", "parse_row_text": "parsing", "output_csv": "output"}),
+    "2.3": ("Parseidon2.3.py", {"group_boxes_by_row": "grouping", "parse_team_rows_smart": "parsing",
+                                "reread_cells": "refine", "crop_rows": "crop", "parse_row_text": "parsing",
+                                "output_csv": "output"}),
+    "Scoreboard_parser": ("Scoreboard_parser.py", {"group_cells_by_row": "grouping",
+                                                   "parse_team_rows_by_column": "parsing",
+                                                   "correct_rows": "constraints"}),
+    "2.15": ("Parseidon2.15.py", {"PreprocessedFrame": "preprocess", "preprocess_cell": "preprocess",
+                                  "split_words_by_slot": "grouping"}),
+}
+
+class StageTimer:
+    """
+    Exclusive wall time per stage: while a wrapped function runs, time spent in nested
+    wrapped calls is charged to their own stage, not to the caller's.
+    """
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._stack = []
+
+    def wrap(self, fn, stage):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            self._stack.append(0.0)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = self._stack.pop()
+                self.totals[stage] += elapsed - nested
+                self.calls[stage] += 1
+                if self._stack:
+                    self._stack[-1] += elapsed
+        return timed
+
+    def wrap_factory(self, factory, stage, methods, method_stage):
+        # Times construction as stage and the named methods of every built object as method_stage
+        timed_factory = self.wrap(factory, stage)
+        def build(*args, **kwargs):
+            obj = timed_factory(*args, **kwargs)
+            for name in methods:
+                if hasattr(obj, name):
+                    setattr(obj, name, self.wrap(getattr(obj, name), method_stage))
+            return obj
+        return build
+
+def load_script(filename):
+    # The scripts have dotted names, so they are loaded from their path
+    path = os.path.join(REPO_DIR, filename)
+    name = os.path.splitext(filename)[0].replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def instrument(module, timer, stages):
+    for name, stage in stages.items():
+        if hasattr(module, name):
+            setattr(module, name, timer.wrap(getattr(module, name), stage))
+    if hasattr(module, "easyocr") or hasattr(module, "get_reader"):
+        # 2.3 and Scoreboard_parser import easyocr inside get_reader(), so it is imported
+        # here to keep its cost under "import", and the timed Reader is installed on the
+        # module object every script gets back from `import easyocr`
+        easyocr = timer.wrap(importlib.import_module, "import")("easyocr")
+        easyocr.Reader = timer.wrap_factory(easyocr.Reader, "model_load", ["readtext"], "ocr")
+    if hasattr(module, "get_backend"):
+        module.get_backend = timer.wrap_factory(
+            module.get_backend, "model_load", ["recognize", "recognize_words"], "ocr")
+
+def run_image(name, module, image_path, workdir):
+    # Runs one pipeline's own main() on one screenshot; returns the CSV it wrote
+    csv_path = os.path.join(workdir, "parsed_scoreboard.csv")
+    if os.path.exists(csv_path):
+        os.remove(csv_path)  # a run that fails must not be scored on the previous image's output
+    if name in ("2.0", "2.2"):
+        module.IMAGE_PATH, module.CSV_OUTPUT = image_path, csv_path
+        module.main()
+    elif name == "2.15":
+        module.INPUT_IMAGE = image_path
+        module.main([])
+    else:
+        module.IMAGE_PATH = image_path
+        module.main(["--csv", csv_path])
+    return csv_path
+
+def read_rows(csv_path):
+    # {lowercased name: {stat: value}} from any pipeline's CSV, whatever its extra columns
+    rows = {}
+    if not os.path.exists(csv_path):
+        return rows
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = (row.get("Name") or "").strip()
+            if name:
+                rows[name.lower()] = {s: (row.get(s) or "").replace(",", "").strip() for s in STAT_FIELDS}
+    return rows
+
+def score_output(csv_path, expected_path):
+    """
+    Accuracy of one output against its golden CSV: players found, stat fields filled
+    with a number (the metric Parseidon 2.3 reports) and stat fields that are correct.
+    """
+    expected = read_rows(expected_path)
+    found = read_rows(csv_path)
+    total = len(expected) * len(STAT_FIELDS)
+    players = filled = correct = exact_rows = 0
+    for name, stats in expected.items():
+        got = found.get(name)
+        if got is None:
+            continue
+        players += 1
+        filled += sum(got[s].isdigit() for s in STAT_FIELDS)
+        matches = sum(got[s] == stats[s] for s in STAT_FIELDS)
+        correct += matches
+        exact_rows += matches == len(STAT_FIELDS)
+    return {"players": players, "expected_players": len(expected), "rows_exact": exact_rows,
+            "fields_filled": filled, "fields_correct": correct, "fields_total": total}
+
+def corpus_for(name):
+    with open(os.path.join(GOLDEN_DIR, "manifest.json"), encoding="utf-8") as f:
+        return [(os.path.join(REPO_DIR, entry["image"]), os.path.join(GOLDEN_DIR, entry["expected"]))
+                for entry in json.load(f) if name in entry["pipelines"]]
+
+def run_child(name, repeat):
+    """
+    Benchmarks one pipeline in this process and returns its result dict. Run in a
+    fresh subprocess per pipeline, so import cost and peak RSS are its own.
+    """
+    filename, stages = PIPELINES[name]
+    corpus = corpus_for(name)
+    timer = StageTimer()
+    workdir = tempfile.mkdtemp(prefix=f"bench-{name}-")
+    os.chdir(workdir)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        module = timer.wrap(load_script, "import")(filename)
+        instrument(module, timer, stages)
+        accuracy = defaultdict(int)
+        per_image = {}
+        for rep in range(repeat):
+            for image_path, expected_path in corpus:
+                image_start = time.perf_counter()
+                csv_path = run_image(name, module, image_path, workdir)
+                seconds = time.perf_counter() - image_start
+                if rep == 0:
+                    scores = score_output(csv_path, expected_path)
+                    per_image[os.path.basename(image_path)] = dict(scores, seconds=round(seconds, 4))
+                    for key, value in scores.items():
+                        accuracy[key] += value
+    wall = time.perf_counter() - start
+    stages_total = {stage: round(t, 4) for stage, t in sorted(timer.totals.items())}
+    stages_total["other"] = round(wall - sum(timer.totals.values()), 4)
+    images = len(corpus) * repeat
+    warm = wall - timer.totals["import"] - timer.totals["model_load"]
+    return {
+        "images": images,
+        "wall_seconds": round(wall, 4),
+        "images_per_sec": round(images / wall, 3) if wall else None,
+        "warm_images_per_sec": round(images / warm, 3) if warm > 0 else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": stages_total,
+        "calls": dict(timer.calls),
+        "accuracy": dict(accuracy),
+        "per_image": per_image,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run_all(names, repeat):
+    results = {}
+    for name in names:
+        print(f"[Bench] {name} ...", flush=True)
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name, "--repeat", str(repeat)],
+                              capture_output=True, text=True)
+        try:
+            results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError):
+            error = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+            print(f"[WARN] {name} failed: {error}")
+            results[name] = {"error": error}
+    return results
+
+def pct(part, whole):
+    return f"{part / whole * 100:.1f}%" if whole else "-"
+
+def print_results(results):
+    print(f"\n{'Pipeline':<18} {'img/s':>7} {'warm':>7} {'peak MB':>8} {'players':>8} {'filled':>7} {'correct':>8}")
+    print("-" * 70)
+    for name, r in results.items():
+        if "error" in r:
+            print(f"{name:<18} error: {r['error']}")
+            continue
+        acc = r["accuracy"]
+        print(f"{name:<18} {r['images_per_sec']:>7} {r['warm_images_per_sec'] or '-':>7} {r['peak_rss_mb']:>8} "
+              f"{acc['players']}/{acc['expected_players']:<6} {pct(acc['fields_filled'], acc['fields_total']):>7} "
+              f"{pct(acc['fields_correct'], acc['fields_total']):>8}")
+        print("    " + ", ".join(f"{stage}={t:.3f}s" for stage, t in r["stages"].items()))
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n--- vs {baseline.get('commit')} ({os.path.basename(baseline_path)}) ---")
+    for name, r in results.items():
+        old = baseline["pipelines"].get(name)
+        if not old or "error" in old or "error" in r:
+            continue
+        speed = (r["warm_images_per_sec"] or 0) / (old["warm_images_per_sec"] or 1)
+        acc, old_acc = r["accuracy"], old["accuracy"]
+        print(f"{name:<18} warm speed x{speed:.2f}, fields correct "
+              f"{old_acc['fields_correct']} -> {acc['fields_correct']}/{acc['fields_total']}, "
+              f"peak {old['peak_rss_mb']} -> {r['peak_rss_mb']} MB")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark over the golden screenshots")
+    parser.add_argument("--pipelines", nargs="+", choices=list(PIPELINES), default=list(PIPELINES))
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over each pipeline's corpus")
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="Earlier results file to compare against")
+    parser.add_argument("--child", choices=list(PIPELINES), help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        print(json.dumps(run_child(args.child, args.repeat)))
+        return
+    commit = git_commit()
+    results = run_all(args.pipelines, args.repeat)
+    print_results(results)
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"commit": commit, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                   "python": platform.python_version(), "repeat": args.repeat, "pipelines": results}, f, indent=2)
+    print(f"\n[Results written to '{output}']")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+if __name__ == "__main__":
+    main()
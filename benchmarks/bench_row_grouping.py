@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from row_grouping import group_by_row
+
+ROW_PITCH = 40
+Y_JITTER = 5
+Y_TOL = 18
+BOXES_PER_ROW = 8
+SIZES = [500, 1000, 2000, 4000, 8000]
+
+def legacy_group_by_row(easyocr_results, y_tol=28):
+    # The original per-script implementation, kept here as the baseline
+    row_map = defaultdict(list)
+    for res in easyocr_results:
+        box, text, conf = res
+        y = (box[0][1] + box[2][1]) // 2
+        found = False
+        for key in row_map:
+            if abs(y - key) <= y_tol:
+                row_map[key].append((box, text, conf))
+                found = True
+                break
+        if not found:
+            row_map[y].append((box, text, conf))
+    rows = []
+    for key in sorted(row_map.keys()):
+        row_items = row_map[key]
+        row_items.sort(key=lambda x: x[0][0][0])
+        rows.append([text for _, text, _ in row_items])
+    return rows
+
+def synthetic_results(num_boxes, seed=0):
+    # EasyOCR-style (box, text, conf) results, emitted top to bottom like the real detector
+    rng = random.Random(seed)
+    results = []
+    for i in range(num_boxes):
+        row, col = divmod(i, BOXES_PER_ROW)
+        y0 = row * ROW_PITCH + rng.randint(0, Y_JITTER)
+        x0 = col * 120 + rng.randint(0, 10)
+        box = [[x0, y0], [x0 + 80, y0], [x0 + 80, y0 + 24], [x0, y0 + 24]]
+        results.append((box, f"r{row}c{col}", rng.random()))
+    return results
+
+def best_time(fn, results, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(results, y_tol=Y_TOL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    print("\n--- group_by_row micro-benchmark ---\n")
+    print(f"{'boxes':>7} {'rows':>6} {'legacy ms':>10} {'sweep ms':>9} {'speedup':>8}  same")
+    for n in SIZES:
+        results = synthetic_results(n)
+        same = legacy_group_by_row(results, y_tol=Y_TOL) == group_by_row(results, y_tol=Y_TOL)
+        legacy = best_time(legacy_group_by_row, results)
+        sweep = best_time(group_by_row, results)
+        rows = -(-n // BOXES_PER_ROW)
+        print(f"{n:>7} {rows:>6} {legacy*1000:>10.2f} {sweep*1000:>9.2f} {legacy/sweep:>7.1f}x  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+ENTRY_POINT = os.path.join(REPO_DIR, "parseidon.py")
+
+# Startup target for the modes that should never touch an OCR engine
+BUDGET_MS = 200
+# Modules whose presence in the import log means an OCR or vision stack was loaded
+HEAVY_MODULES = ("easyocr", "torch", "cv2", "PIL", "pytesseract", "tesserocr", "numpy")
+# What the table command prints about its OCR cache and its output
+CACHE_LINE = re.compile(r"\[Cache\] (\d+) hits, (\d+) misses")
+ROWS_LINE = re.compile(r"\[Summary\] Batch: \d+ screenshots, (\d+) rows\.")
+
+def replay_image():
+    # First golden screenshot of the table (2.3) pipeline
+    with open(os.path.join(BENCH_DIR, "golden", "manifest.json"), encoding="utf-8") as f:
+        entry = next(e for e in json.load(f) if "2.3" in e["pipelines"])
+    return os.path.join(REPO_DIR, entry["image"])
+
+def cache_dir_of(workdir):
+    return os.path.join(workdir, "ocr_cache")
+
+def scenarios(workdir):
+    """
+    (label, parseidon argv) for every startup path measured, all held to BUDGET_MS. The cached
+    replay runs once beforehand to fill its OCR cache, so it needs EasyOCR installed.
+    """
+    cache_dir = cache_dir_of(workdir)
+    replay = ["table", "--cache-dir", cache_dir, "--csv", os.path.join(workdir, "replay.csv"), replay_image()]
+    return [
+        ("parseidon --help", ["--help"]),
+        ("table --help", ["table", "--help"]),
+        ("scoreboard --help", ["scoreboard", "--help"]),
+        ("grid --help", ["grid", "--help"]),
+        ("serve --help", ["serve", "--help"]),
+        ("consensus (sample)", ["consensus"]),
+        ("table (cached replay)", replay),
+    ]
+
+def parse_importtime(stderr):
+    """
+    {top-level module: cumulative microseconds} from `python -X importtime` output.
+    Top-level imports are the lines without nesting indentation.
+    """
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # nested imports are indented under their parent
+            cumulative[name.strip()] = int(cum)
+    return cumulative
+
+def failure_reason(proc):
+    # Last traceback line, else the parser's own error or per-screenshot failure line
+    lines = (proc.stderr.strip().splitlines()
+             or [line for line in proc.stdout.splitlines() if line.startswith(("Error", "[WARN] Failed"))]
+             or [f"exit code {proc.returncode}"])
+    return lines[-1]
+
+def replay_error(stdout):
+    """
+    Why a cached replay did not run from the cache (a miss, no hits or no rows written),
+    or None if it did. A replay that misses loads EasyOCR, so its timing is not a cached
+    startup.
+    """
+    cache, rows = CACHE_LINE.search(stdout), ROWS_LINE.search(stdout)
+    if cache is None or rows is None:
+        return "replay printed no cache or row summary"
+    hits, misses = int(cache.group(1)), int(cache.group(2))
+    if misses or not hits:
+        return f"replay missed the OCR cache ({hits} hits, {misses} misses)"
+    if not int(rows.group(1)):
+        return "replay wrote no rows"
+    return None
+
+def loaded_heavy(stderr):
+    names = {line.rsplit("|", 1)[-1].strip() for line in stderr.splitlines() if line.startswith("import time:")}
+    return [m for m in HEAVY_MODULES if m in names]
+
+def measure(argv, repeat, workdir, cached=False):
+    """
+    Median wall time over repeat plain runs (-X importtime slows imports down, so it is
+    not used for those), plus the import breakdown from one -X importtime run. With
+    cached, a run that did not replay from the OCR cache is an error, not a timing.
+    """
+    walls = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, ENTRY_POINT] + argv, cwd=workdir, capture_output=True, text=True)
+        walls.append((time.perf_counter() - start) * 1000)
+        if proc.returncode != 0:
+            return {"error": failure_reason(proc)}
+        error = replay_error(proc.stdout) if cached else None
+        if error:
+            return {"error": error}
+    stderr = subprocess.run([sys.executable, "-X", "importtime", ENTRY_POINT] + argv,
+                            cwd=workdir, capture_output=True, text=True).stderr
+    imports = parse_importtime(stderr)
+    top = sorted(imports.items(), key=lambda kv: -kv[1])[:5]
+    return {"wall_ms": round(statistics.median(walls), 1), "import_ms": round(sum(imports.values()) / 1000, 1),
+            "heavy": loaded_heavy(stderr), "top_imports": [(name, round(us / 1000, 1)) for name, us in top]}
+
+def run_all(repeat):
+    workdir = tempfile.mkdtemp(prefix="bench-startup-")
+    results = {}
+    try:
+        for label, argv in scenarios(workdir):
+            print(f"[Bench] {label} ...", flush=True)
+            cached = "--cache-dir" in argv
+            if cached:
+                # Fill the OCR cache; only the re-parse after it is measured
+                warm = subprocess.run([sys.executable, ENTRY_POINT] + argv, cwd=workdir, capture_output=True, text=True)
+                error = None
+                if warm.returncode != 0:
+                    error = failure_reason(warm)
+                elif not any(files for _, _, files in os.walk(cache_dir_of(workdir))):
+                    error = "OCR cache is still empty after the warm-up run"
+                if error:
+                    print(f"[WARN] {label}: could not fill the OCR cache: {error}")
+                    results[label] = {"error": error}
+                    continue
+            results[label] = measure(argv, repeat, workdir, cached)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+def print_results(results):
+    print(f"\n{'Scenario':<24} {'wall ms':>8} {'import ms':>10}  heavy modules loaded")
+    print("-" * 72)
+    for label, r in results.items():
+        if "error" in r:
+            print(f"{label:<24} error: {r['error']}")
+            continue
+        over = " [over budget]" if r["wall_ms"] > BUDGET_MS else ""
+        print(f"{label:<24} {r['wall_ms']:>8} {r['import_ms']:>10}  {', '.join(r['heavy']) or '-'}{over}")
+        print("    " + ", ".join(f"{name}={ms}ms" for name, ms in r["top_imports"]))
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Startup time of the parseidon entry point, from -X importtime")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario; the median is reported")
+    parser.add_argument("--output", help="Also write the results here as JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run_all(args.repeat)
+    print_results(results)
+    print(f"\n[Budget] {BUDGET_MS} ms wall for --help, the consensus sample and cached replays")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "budget_ms": BUDGET_MS,
+                       "scenarios": results}, f, indent=2)
+        print(f"[Results written to '{args.output}']")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from layout_detect import TableGrid
+
+# Hand-tuned cell grid of the 5v5 scoreboard, shared by Parseidon 2.15 and 3.5
+BASE_Y = 156
+ROW_HEIGHT = 46
+NUM_ROWS = 10
+NUM_COLS = 7
+CROP_TOP_PAD = 6
+CROP_BOTTOM_PAD = 4
+
+# (x0, x1) for each column, hand-tuned
+COL_X = {
+    1: (80, 285),      # Name (wider)
+    2: (292, 328),     # Goal
+    3: (339, 375),     # Assist
+    4: (388, 427),     # Pass
+    5: (440, 510),     # Interception
+    6: (525, 600),     # Save
+    7: (1060, 1130),   # Score
+}
+
+DEFAULT_GRID = TableGrid(BASE_Y, ROW_HEIGHT, COL_X)
+
+def get_crop_box(row, col, grid=DEFAULT_GRID):
+    # The second team's rows sit team_gap lower, below the Total match and AWAY rows
+    top = grid.base_y + (row - 1) * grid.row_height + (grid.team_gap if row > NUM_ROWS // 2 else 0)
+    y0 = top + CROP_TOP_PAD
+    y1 = top + grid.row_height - CROP_BOTTOM_PAD
+    x0, x1 = grid.col_x[col]
+    return int(x0), int(y0), int(x1), int(y1)
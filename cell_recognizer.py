@@ -0,0 +1,71 @@
+from instrumentation import METRICS
+
+CELL_PAD = 4
+SLOT_GAP = 8  # blank pixels between cells stacked into one composite
+DIGIT_ALLOWLIST = "0123456789,"
+
+def layout_cells(layout, num_fields, pad=CELL_PAD):
+    """
+    Cell rectangles (x0, y0, x1, y1) for every row of a detected Layout: one per field
+    from the rightmost num_fields column segments (segments further left are avatars
+    and badges), then a tail cell out to the right edge where the MVP tag sits.
+    Returns None if the layout has too few columns.
+    """
+    if len(layout.cols) < num_fields:
+        return None
+    cols = layout.cols[-num_fields:]
+    rows = []
+    for y0, y1 in layout.rows:
+        # Bands hug the glyphs; the recognizer wants a little margin around them
+        margin = (y1 - y0) // 4
+        top, bottom = max(0, y0 - margin), min(layout.height, y1 + margin)
+        cells = [(max(0, x0 - pad), top, min(layout.width, x1 + pad), bottom) for x0, x1 in cols]
+        tail_x = min(layout.width - 1, cols[-1][1] + pad)
+        cells.append((tail_x, top, layout.width, bottom))
+        rows.append(cells)
+    return rows
+
+def stack_cells(crops, gap=SLOT_GAP):
+    """
+    Stacks grayscale crops top to bottom into one composite padded with their median
+    value. Returns (composite, boxes), one [x_min, x_max, y_min, y_max] box per crop:
+    the horizontal_list format EasyOCR's recognize() takes.
+    """
+    import numpy as np
+    width = max(c.shape[1] for c in crops) + 2 * gap
+    height = gap + sum(c.shape[0] + gap for c in crops)
+    background = int(np.median(np.concatenate([c.ravel() for c in crops])))
+    composite = np.full((height, width), background, dtype=np.uint8)
+    boxes = []
+    y = gap
+    for crop in crops:
+        h, w = crop.shape
+        composite[y:y + h, gap:gap + w] = crop
+        boxes.append([gap, gap + w, y, y + h])
+        y += h + gap
+    return composite, boxes
+
+def recognize_cells(reader, crops, allowlist=None):
+    """
+    Reads every crop with a single recognize() call over their composite, so CRAFT
+    text detection never runs. Returns [(text, conf)] in crop order, ("", 0.0) where
+    the recognizer returned nothing.
+    The readers here run with gpu=False, and on CPU EasyOCR's recognize() still runs
+    its model once per box: batch_size=len(boxes) does not make one tensor out of the
+    call. What a bigger batch saves is per-call overhead, not model time.
+    """
+    if not crops:
+        return []
+    composite, boxes = stack_cells(crops)
+    with METRICS.timer("recognize"):
+        results = reader.recognize(composite, horizontal_list=boxes, free_list=[], detail=1,
+                                   paragraph=False, allowlist=allowlist, batch_size=len(boxes))
+    METRICS.count("cells_recognized", len(crops))
+    # Results carry their input box, so they are matched back by its top edge
+    slot_by_top = {box[2]: i for i, box in enumerate(boxes)}
+    read = [("", 0.0)] * len(crops)
+    for box, text, conf in results:
+        slot = slot_by_top.get(int(box[0][1]))
+        if slot is not None:
+            read[slot] = (text.strip(), float(conf))
+    return read
@@ -0,0 +1,141 @@
+import threading
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from ocr_cache import CropCache
+from tesseract_backend import DIGIT_WHITELIST, NAME_WHITELIST, get_backend
+
+THRESH_NONE = None  # hand the grayscale crop to the engine as-is
+THRESH_OTSU = -1
+
+# One OCR pass over a cell: which engine, how the crop is binarized and how much it is upscaled
+Variant = namedtuple("Variant", "engine threshold scale")
+
+# Cheapest first; variants run in waves and a cell stops at the first wave that reaches agreement
+DEFAULT_VARIANTS = (
+    Variant("tesseract", 140, 1),
+    Variant("tesseract", 160, 2),
+    Variant("easyocr", THRESH_NONE, 1),
+    Variant("tesseract", THRESH_OTSU, 2),
+    Variant("tesseract", 120, 3),
+    Variant("easyocr", THRESH_NONE, 2),
+)
+DEFAULT_AGREEMENT = 2
+DEFAULT_WAVE_SIZE = 2
+DEFAULT_WORKERS = 4
+
+def clean_candidate(text, numeric):
+    text = text.strip()
+    return text.replace(",", "").replace(" ", "") if numeric else text
+
+def has_agreement(candidates, numeric, agreement):
+    # True once one reading (a number, for stat cells) has been seen agreement times
+    votes = [c for c in candidates if c and (not numeric or c.isdigit())]
+    return bool(votes) and Counter(votes).most_common(1)[0][1] >= agreement
+
+def preprocess_variant(gray, box, variant):
+    import cv2
+    x0, y0, x1, y1 = box
+    crop = gray[y0:y1, x0:x1]
+    if variant.scale != 1:
+        crop = cv2.resize(crop, None, fx=variant.scale, fy=variant.scale, interpolation=cv2.INTER_CUBIC)
+    if variant.threshold is THRESH_NONE:
+        return crop
+    if variant.threshold == THRESH_OTSU:
+        return cv2.threshold(crop, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+    return cv2.threshold(crop, variant.threshold, 255, cv2.THRESH_BINARY)[1]
+
+class ConsensusEngine:
+    """
+    Produces several candidate readings per cell for Parseidon 3.5's consensus_value.
+    Variants run in waves of wave_size across all unresolved cells at once on a thread
+    pool; after each wave, cells whose candidates already agree agreement times drop
+    out, so only ambiguous cells pay for the later (slower) variants.
+    """
+
+    def __init__(self, variants=DEFAULT_VARIANTS, agreement=DEFAULT_AGREEMENT,
+                 wave_size=DEFAULT_WAVE_SIZE, workers=DEFAULT_WORKERS, tesseract_backend="pytesseract"):
+        self.variants = list(variants)
+        self.agreement = agreement
+        self.wave_size = wave_size
+        self.tesseract_backend = tesseract_backend
+        self.passes = 0
+        self.cache = CropCache()
+        self._cache_lock = threading.Lock()
+        self._local = threading.local()
+        self._backends = []
+        self._reader = None
+        self._reader_lock = threading.Lock()
+        # Kept for the engine's lifetime so per-thread tesseract handles are reused across images
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="consensus")
+
+    def _tesseract(self):
+        # tesserocr handles are not thread-safe, so every pool thread gets its own backend
+        backend = getattr(self._local, "backend", None)
+        if backend is None:
+            backend = self._local.backend = get_backend(self.tesseract_backend)
+            self._backends.append(backend)
+        return backend
+
+    def _easyocr(self, crop, numeric):
+        # One shared Reader; EasyOCR passes are serialized while tesseract passes run alongside
+        with self._reader_lock:
+            if self._reader is None:
+                try:
+                    import easyocr
+                except ImportError:
+                    raise ImportError("EasyOCR variants need 'pip install easyocr'")
+                self._reader = easyocr.Reader(["en"], gpu=False)
+            results = self._reader.readtext(crop, detail=0, paragraph=True,
+                                            allowlist=DIGIT_WHITELIST if numeric else None)
+        return results[0] if results else ""
+
+    def run_variant(self, gray, box, numeric, variant):
+        crop = preprocess_variant(gray, box, variant)
+        # Repeated glyphs ("0" stats) under the same variant are recognized once
+        key = self.cache.key(crop, f"{variant.engine}|{numeric}")
+        with self._cache_lock:
+            text = self.cache.get(key)
+        if text is not None:
+            return text
+        if variant.engine == "easyocr":
+            text = self._easyocr(crop, numeric)
+        else:
+            text = self._tesseract().recognize(crop, DIGIT_WHITELIST if numeric else NAME_WHITELIST)
+        text = clean_candidate(text, numeric)
+        with self._cache_lock:
+            self.passes += 1
+            self.cache.put(key, text)
+        return text
+
+    def read_cells(self, image, cells):
+        """
+        cells is a list of (key, (x0, y0, x1, y1), numeric). Returns {key: [candidates]}
+        in variant order.
+        """
+        import cv2
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        candidates = {key: [] for key, _, _ in cells}
+        pending = list(cells)
+        for start in range(0, len(self.variants), self.wave_size):
+            wave = self.variants[start:start + self.wave_size]
+            jobs = [(key, self._pool.submit(self.run_variant, gray, box, numeric, variant))
+                    for key, box, numeric in pending for variant in wave]
+            for key, job in jobs:
+                candidates[key].append(job.result())
+            pending = [cell for cell in pending
+                       if not has_agreement(candidates[cell[0]], cell[2], self.agreement)]
+            print(f"[Consensus] Wave {start // self.wave_size + 1}: "
+                  f"{len(cells) - len(pending)}/{len(cells)} cells agreed")
+            if not pending:
+                break
+        return candidates
+
+    def stats(self, num_cells):
+        most = num_cells * len(self.variants)
+        return f"{self.passes} OCR passes for {num_cells} cells (up to {most} without early stopping)"
+
+    def close(self):
+        self._pool.shutdown()
+        for backend in self._backends:
+            backend.close()
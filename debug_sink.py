@@ -0,0 +1,86 @@
+import os
+import queue
+import threading
+import zipfile
+
+DEBUG_FORMATS = ("zip", "npz", "png")
+DEBUG_SAMPLING = ("off", "all", "failing")
+DEFAULT_QUEUE_SIZE = 256
+
+class DebugSink:
+    """
+    Writes debug crops from a background thread so PNG encoding and disk I/O stay
+    off the OCR path. Crops are queued per screenshot and written as one archive
+    per screenshot: <id>.zip of PNGs, <id>.npz of raw arrays, or a <id>/ folder of
+    PNGs. The queue is bounded, so a slow disk throttles the producer instead of
+    buffering a whole batch in memory. Queued arrays must not be modified afterwards.
+    With sampling="failing" only crops flagged as failing are kept.
+    """
+
+    def __init__(self, out_dir, fmt="zip", sampling="all", max_queue=DEFAULT_QUEUE_SIZE):
+        if fmt not in DEBUG_FORMATS:
+            raise ValueError(f"Unknown debug format '{fmt}' (choose from {', '.join(DEBUG_FORMATS)})")
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.sampling = sampling
+        self.written = 0
+        self._open = {}
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="debug-sink", daemon=True)
+        self._thread.start()
+
+    def add(self, screenshot_id, name, image, failing=False):
+        if self.sampling == "all" or failing:
+            self._queue.put(("add", screenshot_id, name, image))
+
+    def finish(self, screenshot_id):
+        # Closes that screenshot's archive once everything queued before it is written
+        self._queue.put(("finish", screenshot_id, None, None))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                for screenshot_id in list(self._open):
+                    self._finish(screenshot_id)
+                return
+            action, screenshot_id, name, image = item
+            try:
+                if action == "add":
+                    self._add(screenshot_id, name, image)
+                else:
+                    self._finish(screenshot_id)
+            except Exception as e:
+                print(f"[WARN] Debug sink failed on {screenshot_id}/{name}: {e}")
+
+    def _add(self, screenshot_id, name, image):
+        # Imported here so a run without --debug-crops never loads OpenCV
+        import cv2
+        import numpy as np
+        if self.fmt == "npz":
+            self._open.setdefault(screenshot_id, {})[name] = np.ascontiguousarray(image)
+        elif self.fmt == "zip":
+            archive = self._open.get(screenshot_id)
+            if archive is None:
+                archive = zipfile.ZipFile(os.path.join(self.out_dir, f"{screenshot_id}.zip"), "w",
+                                          zipfile.ZIP_STORED)
+                self._open[screenshot_id] = archive
+            archive.writestr(f"{name}.png", cv2.imencode(".png", image)[1].tobytes())
+        else:
+            folder = os.path.join(self.out_dir, screenshot_id)
+            os.makedirs(folder, exist_ok=True)
+            cv2.imwrite(os.path.join(folder, f"{name}.png"), image)
+        self.written += 1
+
+    def _finish(self, screenshot_id):
+        import numpy as np
+        pending = self._open.pop(screenshot_id, None)
+        if self.fmt == "npz" and pending:
+            np.savez_compressed(os.path.join(self.out_dir, f"{screenshot_id}.npz"), **pending)
+        elif self.fmt == "zip" and pending is not None:
+            pending.close()
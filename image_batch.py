@@ -0,0 +1,43 @@
+import glob
+import io
+import os
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+
+def is_image_file(path):
+    return os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS)
+
+def load_image(source, mode=None):
+    """
+    Decodes a screenshot (a path, or encoded bytes from the API) into a numpy array,
+    converted to mode ("RGB", "L") if given. PIL is only imported on first use, so
+    re-parses served entirely from the OCR cache never load it.
+    """
+    import numpy as np
+    from PIL import Image
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    image = Image.open(source)
+    return np.asarray(image.convert(mode) if mode else image)
+
+def collect_images(targets):
+    """
+    Expands a list of files, directories and glob patterns into a sorted,
+    de-duplicated list of screenshot paths.
+    """
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            found = [os.path.join(target, f) for f in sorted(os.listdir(target))]
+        elif glob.has_magic(target):
+            found = sorted(glob.glob(target))
+        else:
+            found = [target]
+        paths.extend(p for p in found if is_image_file(p) or p == target)
+    seen = set()
+    images = []
+    for p in paths:
+        if p not in seen:
+            seen.add(p)
+            images.append(p)
+    return images
@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Upper bounds in seconds of the stage latency buckets (cumulative, Prometheus style)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+METRIC_PREFIX = "parseidon"
+
+# [DEBUG] dumps (raw OCR boxes, grouped rows, per-row parses) cost real time on big
+# batches, so they are off unless a run asks for them with --debug
+DEBUG = False
+
+def set_debug(enabled):
+    global DEBUG
+    DEBUG = enabled
+
+def debug(*args, **kwargs):
+    if DEBUG:
+        print(*args, **kwargs)
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def merge(self, other):
+        self.count += other["count"]
+        self.sum += other["sum"]
+        self.counts = [a + b for a, b in zip(self.counts, other["buckets"])]
+
+    def to_dict(self):
+        return {"count": self.count, "sum": round(self.sum, 6), "buckets": list(self.counts)}
+
+class Metrics:
+    """
+    Process-wide stage timers and counters. timer(stage) records wall time into one
+    histogram per stage; count(name) bumps a counter. Both are thread-safe, so the
+    async API's executor threads can share one instance.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = defaultdict(int)
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            if stage not in self._stages:
+                self._stages[stage] = Histogram(self.buckets)
+            self._stages[stage].observe(seconds)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self._counters[name] += n
+
+    def snapshot(self):
+        with self._lock:
+            return {"counters": dict(self._counters),
+                    "stages": {stage: h.to_dict() for stage, h in self._stages.items()}}
+
+    def drain(self):
+        # Snapshot and reset; pool workers hand their share back to the parent this way
+        with self._lock:
+            snap = {"counters": dict(self._counters),
+                    "stages": {stage: h.to_dict() for stage, h in self._stages.items()}}
+            self._stages.clear()
+            self._counters.clear()
+        return snap
+
+    def merge(self, snap):
+        with self._lock:
+            for name, n in snap["counters"].items():
+                self._counters[name] += n
+            for stage, hist in snap["stages"].items():
+                if stage not in self._stages:
+                    self._stages[stage] = Histogram(self.buckets)
+                self._stages[stage].merge(hist)
+
+    def to_prometheus(self, prefix=METRIC_PREFIX):
+        snap = self.snapshot()
+        lines = []
+        for name, n in sorted(snap["counters"].items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {n}")
+        if snap["stages"]:
+            metric = f"{prefix}_stage_seconds"
+            lines.append(f"# HELP {metric} Wall time per pipeline stage")
+            lines.append(f"# TYPE {metric} histogram")
+            for stage, hist in sorted(snap["stages"].items()):
+                for bound, n in zip(self.buckets, hist["buckets"]):
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{bound}"}} {n}')
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {hist["count"]}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {hist["sum"]}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {hist["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        # Written whole and renamed, so a node_exporter textfile collector never sees half a file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def append_log(self, path, **fields):
+        # One JSON line per call: the running totals plus whatever context the caller adds
+        record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), **fields, **self.snapshot()}
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def summary(self):
+        snap = self.snapshot()
+        parts = [f"{stage}={h['sum']:.3f}s/{h['count']}" for stage, h in sorted(snap["stages"].items())]
+        return ", ".join(parts) or "nothing timed"
+
+METRICS = Metrics()
+
+def add_arguments(parser):
+    # The instrumentation flags every pipeline CLI shares
+    parser.add_argument("--debug", action="store_true",
+                        help="Print the [DEBUG] dumps (raw OCR boxes, grouped rows, per-row parses)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="Write stage timing histograms and counters here in Prometheus text format")
+    parser.add_argument("--metrics-log", metavar="FILE",
+                        help="After each screenshot, append the running stage timings and counters as a JSON line")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="Run under cProfile and save the stats here (pstats format)")
+
+def configure(args):
+    # Callers whose CLI has no --debug (the async API server) stay quiet
+    set_debug(getattr(args, "debug", False))
+
+def flush(args, **fields):
+    # Writes whichever metric outputs the run asked for
+    if args.metrics:
+        METRICS.write_prometheus(args.metrics)
+    if args.metrics_log:
+        METRICS.append_log(args.metrics_log, **fields)
+
+@contextmanager
+def profiled(path, top=15):
+    """
+    Runs the block under cProfile when path is set and saves the stats there (open them
+    with pstats or snakeviz). Stage work lives in plain named functions, so py-spy
+    attached from outside shows the same stages without this.
+    """
+    if not path:
+        yield
+        return
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"\n[Profile] Saved to '{path}'. Top {top} by cumulative time:")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
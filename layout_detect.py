@@ -0,0 +1,247 @@
+import json
+import os
+from collections import namedtuple
+
+from instrumentation import METRICS
+
+# Scoreboard text is light grey/white on a dark UI: bright, low-chroma pixels count as ink,
+# which keeps colourful avatars and team badges out of the profiles
+INK_THRESHOLD = 150
+MAX_INK_CHROMA = 40
+MIN_ROW_FILL = 0.002     # fraction of a pixel row that must be ink to count as text
+MIN_BAND_HEIGHT = 8
+BAND_MERGE_GAP = 4       # joins descenders/accents split off a text line
+MAX_PITCH_SPREAD = 0.15  # std/mean of row pitch allowed for a fixed-pitch grid
+MIN_CELLS_PER_ROW = 5    # table rows have a name plus stats; tabs, labels and titles have fewer
+HIGHLIGHT_FILL = 0.25    # a band this full of ink is a highlighted (MVP) row: a light bar behind its text
+HIGHLIGHT_CONTRAST = 40  # gray levels a highlighted row's text stands out from its bar, either way
+ROI_WORK_WIDTH = 1280    # the table pre-pass subsamples wider frames down to about this width
+# EasyOCR's detector still finds every scoreboard word with glyphs this tall, so larger text
+# is detected on a downscaled frame (recognition always reads the full-resolution crops)
+MIN_DETECT_TEXT_HEIGHT = 12
+AUTO_SCALE = "auto"
+# Full-scale detection until bench_pipelines shows AUTO_SCALE leaves field accuracy unchanged
+DEFAULT_DETECT_SCALE = 1.0
+
+# rows: [(y0, y1)] table-row bands, cols: [(x0, x1)] column segments across those rows
+Layout = namedtuple("Layout", "width height rows cols")
+# box: (x0, y0, x1, y1) around the tables, text_height: height of the header row's text
+TableRegion = namedtuple("TableRegion", "box text_height")
+# The fixed-pitch grid Parseidon 2.15 crops from; team_gap is the extra space (the Total
+# match and AWAY rows) above the second team's first row, 0 for one unbroken run
+TableGrid = namedtuple("TableGrid", "base_y row_height col_x team_gap", defaults=(0,))
+
+def ink_mask(image, threshold=INK_THRESHOLD, max_chroma=MAX_INK_CHROMA):
+    import numpy as np
+    if image.ndim == 2:
+        return image > threshold
+    rgb = image[..., :3].astype(np.int16)
+    return (rgb.mean(axis=2) > threshold) & (rgb.max(axis=2) - rgb.min(axis=2) < max_chroma)
+
+def find_runs(profile, min_value, merge_gap=0, min_length=1):
+    # Returns [(start, end)] runs where profile > min_value; gaps <= merge_gap are bridged
+    import numpy as np
+    on = np.flatnonzero(profile > min_value)
+    if not len(on):
+        return []
+    breaks = np.flatnonzero(np.diff(on) > merge_gap + 1)
+    starts = np.concatenate(([on[0]], on[breaks + 1]))
+    ends = np.concatenate((on[breaks], [on[-1]])) + 1
+    return [(int(s), int(e)) for s, e in zip(starts, ends) if e - s >= min_length]
+
+def highlight_text(image, y0, y1):
+    # Text of a highlighted band: whatever stands out from its column's bar colour. The bar
+    # fills the band top to bottom, so the per-column median is the bar, gradient and all.
+    import numpy as np
+    band = image[y0:y1].astype(np.int16)
+    gray = band if band.ndim == 2 else band[..., :3].mean(axis=2)
+    return np.abs(gray - np.median(gray, axis=0)) > HIGHLIGHT_CONTRAST
+
+def detect_layout(image, min_cells=MIN_CELLS_PER_ROW):
+    """
+    Finds table rows and columns from projection profiles of the thresholded frame.
+    Row bands come from the horizontal profile; a band is kept as a table row when its
+    own vertical profile splits into at least min_cells separate cells. A highlighted
+    row's bar passes the ink threshold almost everywhere, so its cells are found from
+    highlight_text instead, and its band is narrowed to that text. Columns come from the
+    vertical profile of the plain rows together (the highlighted row's MVP tag would
+    add one).
+    """
+    import numpy as np
+    image = np.asarray(image)
+    ink = ink_mask(image)
+    height, width = ink.shape
+    bands = find_runs(ink.sum(axis=1), MIN_ROW_FILL * width, BAND_MERGE_GAP, MIN_BAND_HEIGHT)
+    if not bands:
+        return Layout(width, height, [], [])
+    # Gaps between columns are wider than the spaces inside a name or number
+    cell_gap = max(12, int(np.median([y1 - y0 for y0, y1 in bands]) * 0.6))
+    rows = []
+    plain = []
+    for y0, y1 in bands:
+        text = ink[y0:y1]
+        highlighted = text.mean() > HIGHLIGHT_FILL
+        if highlighted:
+            text = highlight_text(image, y0, y1)
+            lines = find_runs(text.sum(axis=1), 0)
+            if not lines:
+                continue
+            text = text[lines[0][0]:lines[-1][1]]
+            y0, y1 = y0 + lines[0][0], y0 + lines[-1][1]
+        cells = find_runs(text.sum(axis=0), 0, cell_gap)
+        if len(cells) >= min_cells:
+            rows.append((y0, y1))
+            if not highlighted:
+                plain.append(text)
+    cols = []
+    if plain:
+        cols = find_runs(np.concatenate(plain).sum(axis=0), 0, cell_gap)
+    return Layout(width, height, rows, cols)
+
+def pitch_spread(centers):
+    # (std/mean of the pitch, median pitch) of consecutive row centres
+    import numpy as np
+    pitches = np.diff(centers)
+    return float(pitches.std() / max(pitches.mean(), 1)), float(np.median(pitches))
+
+def fit_row_grid(rows, num_rows):
+    """
+    Returns (base_y, row_height, team_gap) for num_rows table rows, or None if the bands
+    do not fit. Tries one evenly spaced run first (picking the most regular window),
+    then two teams of num_rows // 2 on either side of the widest gap between bands:
+    the last rows before it and the first rows after it, each evenly spaced, at the
+    same pitch.
+    """
+    if len(rows) < num_rows or num_rows < 2:
+        return None
+    centers = [(y0 + y1) / 2 for y0, y1 in rows]
+    spread, window = min((pitch_spread(centers[start:start + num_rows]), centers[start:start + num_rows])
+                         for start in range(len(centers) - num_rows + 1))
+    if spread[0] <= MAX_PITCH_SPREAD:
+        row_height = spread[1]
+        return int(round(window[0] - row_height / 2)), int(round(row_height)), 0
+    team_rows = num_rows // 2
+    if num_rows % 2 or team_rows < 2:
+        return None
+    gaps = [b - a for a, b in zip(centers, centers[1:])]
+    split = gaps.index(max(gaps)) + 1
+    home, away = centers[max(0, split - team_rows):split], centers[split:split + team_rows]
+    if len(home) < team_rows or len(away) < team_rows:
+        return None
+    (home_spread, home_pitch), (away_spread, away_pitch) = pitch_spread(home), pitch_spread(away)
+    if (max(home_spread, away_spread) > MAX_PITCH_SPREAD
+            or abs(home_pitch - away_pitch) > MAX_PITCH_SPREAD * max(home_pitch, away_pitch)):
+        return None
+    row_height = (home_pitch + away_pitch) / 2
+    team_gap = away[0] - (home[0] + team_rows * row_height)
+    return int(round(home[0] - row_height / 2)), int(round(row_height)), int(round(team_gap))
+
+def fit_table_grid(layout, num_rows, num_cols, pad=4):
+    # TableGrid for a fixed-pitch table, or None if the layout does not match the expected shape
+    grid = fit_row_grid(layout.rows, num_rows)
+    if grid is None or len(layout.cols) < num_cols:
+        return None
+    base_y, row_height, team_gap = grid
+    # Extra segments sit left of the name column (avatars, badges); the stat columns are rightmost
+    cols = layout.cols[-num_cols:]
+    col_x = {i + 1: (max(0, x0 - pad), min(layout.width, x1 + pad)) for i, (x0, x1) in enumerate(cols)}
+    return TableGrid(base_y, row_height, col_x, team_gap)
+
+def detect_table_region(image):
+    """
+    TableRegion around the scoreboard tables, or None if no table rows are found.
+    A layout pass on a subsampled frame finds the table rows; the region is padded by
+    the row pitch so the HOME/AWAY labels and Total match rows stay in, and runs to
+    the right edge for the (coloured, so not ink) MVP tag. Tabs, the result banner
+    and the matchmaking/Back bar fall outside it.
+    """
+    import numpy as np
+    image = np.asarray(image)
+    height, width = image.shape[:2]
+    step = max(1, round(width / ROI_WORK_WIDTH))
+    layout = detect_layout(image[::step, ::step])
+    if not layout.rows:
+        return None
+    rows = [(y0 * step, y1 * step) for y0, y1 in layout.rows]
+    pitches = np.diff([(y0 + y1) / 2 for y0, y1 in rows])
+    pitch = float(np.median(pitches)) if len(pitches) else float(rows[0][1] - rows[0][0]) * 2
+    x0 = layout.cols[0][0] * step if layout.cols else 0
+    box = (max(0, int(x0 - pitch / 2)), max(0, int(rows[0][0] - pitch / 2)),
+           width, min(height, int(rows[-1][1] + pitch * 1.5)))
+    # The first table row is the stat header: plain text, no avatars stretching the band
+    return TableRegion(box, rows[0][1] - rows[0][0])
+
+def offset_boxes(results, dx, dy):
+    # readtext() results from a crop, moved back into full-frame coordinates
+    return [([[x + dx, y + dy] for x, y in box], text, conf) for box, text, conf in results]
+
+def detect_scale(text_height, min_height=MIN_DETECT_TEXT_HEIGHT):
+    # Detector mag_ratio that brings the header text down to min_height; never enlarges
+    return min(1.0, min_height / text_height) if text_height else 1.0
+
+def read_table(reader, image, roi=True, scale=DEFAULT_DETECT_SCALE):
+    """
+    readtext() over one RGB screenshot, with boxes in full-frame coordinates. roi limits
+    text detection to the table region; scale is the detector's mag_ratio (AUTO_SCALE
+    picks it from the header text height). EasyOCR recognizes every detected box from
+    the full-resolution frame whatever the detector scale.
+    """
+    table = None
+    if roi or scale == AUTO_SCALE:
+        with METRICS.timer("roi"):
+            table = detect_table_region(image)
+        if table is None:
+            print("[WARN] No table found in the pre-pass. Reading the full screenshot at full scale.")
+    if scale == AUTO_SCALE:
+        scale = detect_scale(table.text_height) if table is not None else 1.0
+    x0, y0 = 0, 0
+    if roi and table is not None:
+        x0, y0, x1, y1 = table.box
+        image = image[y0:y1, x0:x1]
+    with METRICS.timer("readtext"):
+        results = reader.readtext(image, detail=1, paragraph=False, mag_ratio=float(scale))
+    return offset_boxes(results, x0, y0)
+
+def parse_scale(value):
+    # argparse type for --detect-scale: "auto" or a factor in (0, 1]
+    if value == AUTO_SCALE:
+        return value
+    scale = float(value)
+    if not 0 < scale <= 1:
+        raise ValueError(f"detector scale must be in (0, 1], got {value}")
+    return scale
+
+class LayoutCache:
+    """
+    Layouts per (width, height): detection runs once per resolution, and every later
+    screenshot of that size reuses it. Optionally persisted to a JSON file. The rows
+    are those of the first screenshot seen (a highlighted MVP row or a smaller team
+    can change them), so callers that need every player row detect rows per image.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._layouts = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for entry in json.load(f):
+                    layout = Layout(entry["width"], entry["height"],
+                                    [tuple(r) for r in entry["rows"]], [tuple(c) for c in entry["cols"]])
+                    self._layouts[(layout.width, layout.height)] = layout
+
+    def get(self, image):
+        import numpy as np
+        image = np.asarray(image)
+        size = (image.shape[1], image.shape[0])
+        layout = self._layouts.get(size)
+        if layout is None:
+            layout = detect_layout(image)
+            self._layouts[size] = layout
+            self.save()
+        return layout
+
+    def save(self):
+        if not self.path:
+            return
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump([layout._asdict() for layout in self._layouts.values()], f, indent=2)
@@ -0,0 +1,102 @@
+from collections import defaultdict
+
+MEMO_LIMIT = 100000
+
+def edit_distance(a, b):
+    # Levenshtein distance (insertions, deletions and substitutions all cost 1)
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+def bigrams(text):
+    # Padded bigrams: a string of length n has n + 1 of them, and one edit touches at most 2
+    padded = f"^{text}$"
+    return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+def load_roster(path):
+    # One player name per line; blank lines and '#' comments are ignored
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+class NameIndex:
+    """
+    Best-match lookup of OCR'd names against a roster.
+    Exact NAME_CORRECTIONS hits are returned first. Everything else goes through a
+    bigram inverted index: candidates are ranked by shared bigrams, and edit distance
+    is only computed until the bigram bound proves no remaining candidate can win.
+    Results are memoized per raw string.
+    """
+
+    def __init__(self, names=(), corrections=None, min_similarity=0.5):
+        self.corrections = dict(corrections or {})
+        self.min_similarity = min_similarity
+        self._keys = []
+        self._canonical = {}
+        self._postings = defaultdict(list)
+        self._memo = {}
+        self.add_all(names)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, name):
+        key = name.lower()
+        if key in self._canonical:
+            return
+        self._canonical[key] = name
+        key_id = len(self._keys)
+        self._keys.append(key)
+        for gram in set(bigrams(key)):
+            self._postings[gram].append(key_id)
+        self._memo.clear()
+
+    def add_all(self, names):
+        for name in names:
+            self.add(name)
+
+    def nearest(self, query):
+        """
+        Returns (name, similarity) for the closest roster entry by edit distance,
+        or (None, 0.0) if nothing shares a bigram with the query.
+        """
+        query = query.lower()
+        query_grams = set(bigrams(query))
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for key_id in self._postings.get(gram, ()):
+                shared[key_id] += 1
+        best_key = None
+        best_d = None
+        best_sim = 0.0
+        for key_id, count in sorted(shared.items(), key=lambda item: (-item[1], item[0])):
+            # Each edit removes at most 2 of the query's bigrams, so d >= (missing bigrams) / 2
+            min_d = (len(query_grams) - count + 1) // 2
+            if best_d is not None and min_d > best_d:
+                break
+            key = self._keys[key_id]
+            d = edit_distance(query, key)
+            sim = 1 - d / max(len(query), len(key), 1)
+            if best_d is None or d < best_d or (d == best_d and sim > best_sim):
+                best_key, best_d, best_sim = key, d, sim
+        if best_key is None:
+            return None, 0.0
+        return self._canonical[best_key], best_sim
+
+    def match(self, raw):
+        raw = raw.strip()
+        if raw in self.corrections:
+            return self.corrections[raw]
+        if raw in self._memo:
+            return self._memo[raw]
+        name, sim = self.nearest(raw)
+        result = name if name is not None and sim > self.min_similarity else raw
+        if len(self._memo) >= MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[raw] = result
+        return result
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+CACHE_VERSION = 1
+DEFAULT_MAX_MB = 512
+EVICT_LOW_WATER = 0.9  # eviction trims to this fraction of max_bytes, so puts after it do not rescan
+DEFAULT_CROP_ENTRIES = 4096
+
+def image_digest(image):
+    # Content hash of an image path, raw encoded bytes or numpy array
+    h = hashlib.sha256()
+    if isinstance(image, (bytes, bytearray)):
+        h.update(image)
+    elif isinstance(image, str):
+        with open(image, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    else:
+        h.update(f"{image.shape}{image.dtype}".encode())
+        h.update(image.tobytes())
+    return h.hexdigest()
+
+def _plain(v):
+    v = float(v)
+    return int(v) if v.is_integer() else v
+
+def to_jsonable(results):
+    # EasyOCR hands back numpy scalars; store plain (box, text, conf) lists. detail=0
+    # reads are bare strings and are stored as they are
+    return [r if isinstance(r, str) else [[[_plain(v) for v in pt] for pt in r[0]], r[1], float(r[2])]
+            for r in results]
+
+class OCRResultCache:
+    """
+    On-disk cache of raw readtext() results, keyed by image content plus OCR settings.
+    Entries are small JSON files; when the directory grows past max_bytes the least
+    recently used entries (oldest mtime, refreshed on every hit) are evicted down to
+    EVICT_LOW_WATER of it.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, st.st_mtime, st.st_size
+
+    def key(self, image, settings):
+        payload = json.dumps({"v": CACHE_VERSION, "settings": settings}, sort_keys=True)
+        return hashlib.sha256((image_digest(image) + payload).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                results = json.load(f)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return [r if isinstance(r, str) else tuple(r) for r in results]
+
+    def put(self, key, results):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(to_jsonable(results), f)
+        os.replace(tmp_path, path)
+        self._size += os.path.getsize(path)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        self._size = sum(size for _, _, size in entries)
+        low_water = self.max_bytes * EVICT_LOW_WATER
+        for path, _, size in entries:
+            if self._size <= low_water:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+    def fetch(self, image, settings, compute):
+        """
+        Returns cached results for (image, settings), or runs compute() and stores them.
+        """
+        key = self.key(image, settings)
+        results = self.get(key)
+        if results is not None:
+            self.hits += 1
+            return results
+        self.misses += 1
+        results = compute()
+        self.put(key, results)
+        return results
+
+class CropCache:
+    """
+    In-memory LRU cache in front of per-crop OCR calls. Scoreboards repeat the same
+    glyph crops ("0" stats, team labels, the MVP badge), so identical pixels are
+    recognized once and every repeat is a dictionary lookup.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CROP_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, crop, tag=""):
+        # blake2b over the raw pixels; shape and tag keep equal bytes of different crops apart
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{tag}|{crop.shape}|{crop.dtype}".encode())
+        h.update(crop.tobytes())
+        return h.digest()
+
+    def get(self, key):
+        # Cached value for key, or None on a miss
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def fetch(self, crop, compute, tag=""):
+        key = self.key(crop, tag)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
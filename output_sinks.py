@@ -0,0 +1,218 @@
+import csv
+import os
+import sqlite3
+import time
+import uuid
+
+STRING_COLUMNS = {"Source", "Team", "Name"}
+BOOL_COLUMNS = {"is_mvp"}
+DEFAULT_SQLITE_BATCH = 500
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+def column_type(column):
+    # Typed sinks: names and ids are text, is_mvp is a flag, every stat is an integer
+    if column in STRING_COLUMNS:
+        return "string"
+    if column in BOOL_COLUMNS:
+        return "bool"
+    return "int"
+
+class CsvSink:
+    """
+    Writes parsed rows to a CSV as they arrive. In append mode an existing file is
+    extended (the header is only written to a new or empty file), so a long-running
+    process never rewrites earlier results. Every write_rows() call is flushed.
+    """
+
+    def __init__(self, path, header, append=True):
+        self.path = path
+        self.rows_written = 0
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, newline="", encoding="utf-8") as f:
+                existing = next(csv.reader(f), [])
+            if existing != list(header):
+                raise ValueError(f"'{path}' has columns {existing}, expected {list(header)}")
+        self._file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if not exists:
+            self._writer.writerow(header)
+            self._file.flush()
+
+    def write_rows(self, rows):
+        for row in rows:
+            self._writer.writerow(row)
+            self.rows_written += 1
+        self._file.flush()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SqliteSink:
+    """
+    Appends rows to a SQLite table, created on first use. Rows are buffered and inserted
+    with one executemany() per transaction once batch_size rows are pending (and on
+    flush/close). Writing a screenshot again replaces its earlier rows, keyed on the
+    Source column, so re-running a batch does not duplicate matches.
+    """
+
+    SQL_TYPES = {"string": "TEXT", "bool": "INTEGER", "int": "INTEGER"}
+
+    def __init__(self, path, header, table="player_rows", batch_size=DEFAULT_SQLITE_BATCH):
+        self.path = path
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._header = list(header)
+        self._table = table
+        self._pending = []
+        self._conn = sqlite3.connect(path)
+        columns = ", ".join(f'"{c}" {self.SQL_TYPES[column_type(c)]}' for c in self._header)
+        with self._conn:
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+            if "Source" in self._header:
+                self._conn.execute(f'CREATE INDEX IF NOT EXISTS "{table}_source" ON "{table}" ("Source")')
+        quoted = ", ".join(f'"{c}"' for c in self._header)
+        self._insert = f'INSERT INTO "{table}" ({quoted}) VALUES ({", ".join("?" * len(self._header))})'
+
+    def write_rows(self, rows):
+        # A call's rows are never split across transactions, so replacing by Source stays exact
+        self._pending.extend(rows)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self._conn:
+            if "Source" in self._header:
+                idx = self._header.index("Source")
+                sources = [(s,) for s in {row[idx] for row in self._pending}]
+                self._conn.executemany(f'DELETE FROM "{self._table}" WHERE "Source" = ?', sources)
+            self._conn.executemany(self._insert, self._pending)
+        self.rows_written += len(self._pending)
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ParquetSink:
+    """
+    Appends rows to a Parquet dataset directory. Rows go to new part files, so earlier
+    runs are never rewritten, buffered into row groups of row_group_size. flush() writes
+    the pending rows and finishes the current part (a Parquet file is unreadable until
+    its footer is written), so watch mode, which flushes after every screenshot, loses
+    nothing if the daemon is killed; the next rows start a new part. Read the whole
+    season back with pyarrow.dataset or pandas.read_parquet(directory).
+    """
+
+    def __init__(self, directory, header, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("The Parquet sink needs 'pip install pyarrow'")
+        self._pa = pa
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self._header = list(header)
+        arrow_types = {"string": pa.string(), "bool": pa.bool_(), "int": pa.int32()}
+        self._schema = pa.schema([(c, arrow_types[column_type(c)]) for c in self._header])
+        self._pending = []
+        self._pq = pq
+        self._directory = directory
+        self._writer = None
+        self.path = None
+        os.makedirs(directory, exist_ok=True)
+
+    def write_rows(self, rows):
+        self._pending.extend(rows)
+        while len(self._pending) >= self.row_group_size:
+            self._write_group(self._pending[:self.row_group_size])
+            self._pending = self._pending[self.row_group_size:]
+
+    def _write_group(self, rows):
+        if self._writer is None:
+            self.path = os.path.join(self._directory,
+                                     f"part-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet")
+            self._writer = self._pq.ParquetWriter(self.path, self._schema)
+        columns = [self._pa.array([row[i] for row in rows], type=field.type)
+                   for i, field in enumerate(self._schema)]
+        self._writer.write_table(self._pa.Table.from_arrays(columns, schema=self._schema))
+        self.rows_written += len(rows)
+
+    def flush(self):
+        if self._pending:
+            self._write_group(self._pending)
+            self._pending = []
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SinkGroup:
+    # Fans every write out to several sinks; counts rows as the first (CSV) sink does
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    @property
+    def rows_written(self):
+        return self.sinks[0].rows_written
+
+    def write_rows(self, rows):
+        rows = list(rows)
+        for sink in self.sinks:
+            sink.write_rows(rows)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_sinks(csv_path, header, append=True, sqlite_path=None, parquet_dir=None):
+    # The CSV sink plus whichever columnar sinks were asked for
+    sinks = [CsvSink(csv_path, header, append)]
+    if sqlite_path:
+        sinks.append(SqliteSink(sqlite_path, header))
+    if parquet_dir:
+        sinks.append(ParquetSink(parquet_dir, header))
+    return SinkGroup(sinks)
+
+def read_column(path, column):
+    # Set of values in one column of an existing CSV (empty if the file is missing)
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline="", encoding="utf-8") as f:
+        return {row[column] for row in csv.DictReader(f) if row.get(column)}
@@ -0,0 +1,53 @@
+"""
+One entry point for the Parseidon scripts:
+
+    python parseidon.py <command> [options]
+
+Only the chosen command's script is loaded, and the scripts import EasyOCR, torch,
+OpenCV and PIL only once an OCR stage runs, so --help, the consensus sample and
+re-parses served from the OCR cache start without them.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# command -> (script, what it runs)
+COMMANDS = {
+    "table": ("Parseidon2.3.py", "EasyOCR full-table parse with row fallback; batch, watch and recognize-only modes"),
+    "scoreboard": ("Scoreboard_parser.py", "EasyOCR column parse checked against the team totals"),
+    "grid": ("Parseidon2.15.py", "Tesseract on the hand-tuned (or detected) cell grid"),
+    "consensus": ("Parseidon3.5py.py", "Multi-engine consensus per cell; the built-in sample without a screenshot"),
+    "serve": ("async_api.py", "Local HTTP API around the scoreboard parser"),
+}
+
+def load_script(filename):
+    # The scripts have dotted names, so they are loaded from their path
+    path = os.path.join(REPO_DIR, filename)
+    name = os.path.splitext(filename)[0].replace(".", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # pool workers unpickle their tasks by module name
+    spec.loader.exec_module(module)
+    return module
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="parseidon", description="Parseidon scoreboard parsers",
+        epilog="Run 'parseidon <command> --help' for a command's options.",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=sorted(COMMANDS), metavar="command",
+                        help="; ".join(f"{name}: {help}" for name, (_, help) in sorted(COMMANDS.items())))
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Options passed on to the command")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    sys.path.insert(0, REPO_DIR)
+    sys.argv[0] = f"parseidon {args.command}"  # so the command's own --help names it
+    return load_script(COMMANDS[args.command][0]).main(args.args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+NAME_THRESHOLD = 140
+STAT_THRESHOLD = 160
+STAT_DILATE_KERNEL = (2, 2)
+
+class PreprocessedFrame:
+    """
+    Grayscale and the name and stat thresholds, computed once over the table region
+    instead of once per cell. Cells are handed out as zero-copy numpy views into those
+    planes, addressed in full-frame coordinates. Stat cells are dilated one at a time:
+    dilating the whole region would pull neighbouring pixels into each cell's border.
+    """
+
+    def __init__(self, image, region=None):
+        import cv2
+        height, width = image.shape[:2]
+        x0, y0, x1, y1 = region or (0, 0, width, height)
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(width, x1), min(height, y1)
+        self.origin = (x0, y0)
+        roi = image[y0:y1, x0:x1]
+        self.gray = roi if roi.ndim == 2 else cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        _, self.name_thresh = cv2.threshold(self.gray, NAME_THRESHOLD, 255, cv2.THRESH_BINARY)
+        _, self.stat_thresh = cv2.threshold(self.gray, STAT_THRESHOLD, 255, cv2.THRESH_BINARY)
+        self._kernel = cv2.getStructuringElement(cv2.MORPH_RECT, STAT_DILATE_KERNEL)
+
+    def _view(self, plane, box):
+        x0, y0, x1, y1 = box
+        ox, oy = self.origin
+        return plane[y0 - oy:y1 - oy, x0 - ox:x1 - ox]
+
+    def name_cell(self, box):
+        return self._view(self.name_thresh, box)
+
+    def stat_cell(self, box):
+        # A new array, not a view: dilation has to see only the cell's own pixels
+        import cv2
+        return cv2.dilate(self._view(self.stat_thresh, box), self._kernel, iterations=1)
+
+def bounding_region(boxes):
+    # Smallest (x0, y0, x1, y1) covering every box
+    boxes = list(boxes)
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
@@ -0,0 +1,35 @@
+def box_y_center(box):
+    return (box[0][1] + box[2][1]) // 2
+
+def group_boxes_by_row(easyocr_results, y_tol=28):
+    """
+    Groups EasyOCR (box, text, conf) results into table rows.
+    Boxes are sorted once by y-center and split in a single sweep: a new row starts
+    whenever a box sits more than y_tol below the first (topmost) box of the current row.
+    Returns rows of (box, text, conf) tuples, each row sorted left to right.
+    """
+    items = sorted(easyocr_results, key=lambda res: box_y_center(res[0]))
+    rows = []
+    row = []
+    row_y = None
+    for box, text, conf in items:
+        y = box_y_center(box)
+        if row_y is None or y - row_y > y_tol:
+            if row:
+                rows.append(row)
+            row = []
+            row_y = y
+        row.append((box, text, conf))
+    if row:
+        rows.append(row)
+    for row in rows:
+        row.sort(key=lambda x: x[0][0][0])
+    return rows
+
+def group_by_row(easyocr_results, y_tol=28):
+    # Text-only view of group_boxes_by_row, in the shape the parsers expect
+    return [[text for _, text, _ in row] for row in group_boxes_by_row(easyocr_results, y_tol)]
+
+def group_cells_by_row(easyocr_results, y_tol=28):
+    # Rows of (text, conf) cells, for parsers that keep per-field confidence
+    return [[(text, conf) for _, text, conf in row] for row in group_boxes_by_row(easyocr_results, y_tol)]
@@ -0,0 +1,123 @@
+from itertools import combinations
+
+# Goal, Assist, Pass, Interception, Save. The in-game score also rewards actions the
+# scoreboard does not show, so the weighted stats are a lower bound on Score, not an
+# exact match: every player in the sample screenshots scores 200-1550 above it.
+SCORE_WEIGHTS = (1000, 500, 250, 250, 500)
+MAX_STAT = 99  # anything larger in a row is a score, not a stat
+
+def weighted_stats(stats):
+    return sum(w * s for w, s in zip(SCORE_WEIGHTS, stats) if s is not None)
+
+def is_consistent(stats, score):
+    # Every stat read, a plausible score, and the scoring rule does not exceed it
+    return (score is not None and score > MAX_STAT and None not in stats
+            and all(s <= MAX_STAT for s in stats) and weighted_stats(stats) <= score)
+
+def numeric_tokens(cells):
+    """
+    [(value, conf)] for the numbers in a row's (text, conf) cells, left to right.
+    A thousands group split off by OCR ("8," + "750") is joined back together.
+    """
+    tokens = []
+    joining = False
+    for text, conf in cells:
+        digits = text.replace(",", "").replace(".", "").strip()
+        if not digits.isdigit():
+            joining = False
+            continue
+        if joining and len(digits) == 3:
+            value, prev_conf = tokens.pop()
+            tokens.append((value * 1000 + int(digits), min(prev_conf, conf)))
+        else:
+            tokens.append((int(digits), conf))
+        joining = text.strip().endswith(",")
+    return tokens
+
+def best_assignment(stat_tokens, score, num_stats=len(SCORE_WEIGHTS)):
+    """
+    Places (value, conf) tokens, in reading order, into num_stats columns (extra tokens
+    are dropped, unfilled columns stay None). Of the placements the scoring rule allows,
+    picks the one that moves tokens least from where they were read, then the one
+    closest to the score. Returns (placed, ambiguous) where ambiguous is the set of
+    columns other allowed placements disagree on, or None if nothing fits.
+    """
+    feasible = []
+    used = min(len(stat_tokens), num_stats)
+    for picked in combinations(range(len(stat_tokens)), used):
+        for columns in combinations(range(num_stats), used):
+            placed = [None] * num_stats
+            for col, idx in zip(columns, picked):
+                placed[col] = stat_tokens[idx]
+            slack = score - weighted_stats(t[0] if t else None for t in placed)
+            if slack >= 0:
+                cost = (sum(abs(col - idx) for col, idx in zip(columns, picked)), slack)
+                feasible.append((cost, [t[0] if t else None for t in placed], placed))
+    if not feasible:
+        return None
+    _, values, placed = min(feasible, key=lambda f: f[0])
+    ambiguous = {col for col in range(num_stats) if any(f[1][col] != values[col] for f in feasible)}
+    return placed, ambiguous
+
+def correct_stats(cells, score=None, num_stats=len(SCORE_WEIGHTS)):
+    """
+    Re-derives (placed, ambiguous, (score, conf)) from a row's raw (text, conf) cells without
+    more OCR: the score is the last number too large to be a stat, and the small
+    numbers are placed by best_assignment. Returns None if nothing fits.
+    """
+    tokens = numeric_tokens(cells)
+    score_token = (score, None)
+    if score is None:
+        scores = [t for t in tokens if t[0] > MAX_STAT]
+        if not scores:
+            return None
+        score_token = scores[-1]
+    result = best_assignment([t for t in tokens if t[0] <= MAX_STAT], score_token[0], num_stats)
+    return None if result is None else (*result, score_token)
+
+def total_row_value(rows):
+    # The number on a team's "Total match" row, if one was read
+    for row in rows:
+        if any("total" in text.lower() for text, _ in row):
+            values = [value for value, _ in numeric_tokens(row)]
+            if values:
+                return values[-1]
+    return None
+
+def _correct_row(row, cells):
+    num_stats = len(row.stats) - 1
+    if is_consistent(row.stats[:-1], row.score):
+        return False
+    known_score = row.score if row.score is not None and row.score > MAX_STAT else None
+    fixed = correct_stats(cells, known_score, num_stats)
+    if fixed is None:
+        return False
+    placed, ambiguous, (score, score_conf) = fixed
+    for col, token in enumerate(placed):
+        value, conf = token or (None, None)
+        # Columns the rule cannot pin down keep the best guess but lose their confidence,
+        # so they show up as low-confidence cells downstream
+        row.set_field(col + 1, value, None if col in ambiguous else conf)
+    if score != row.score:
+        row.set_field(num_stats + 1, score, score_conf)
+    return True
+
+def correct_rows(player_rows, row_cells, total=None):
+    """
+    Score-constraint pass over one team's PlayerRows, given each row's raw cells after
+    the name. Rows that break the scoring rule (shifted or missing columns, a score in
+    a stat column) are re-placed from their own numbers. The team's "Total match" then
+    supplies a single missing score. Returns the number of rows corrected.
+    """
+    corrected = {id(row) for row, cells in zip(player_rows, row_cells) if _correct_row(row, cells)}
+    if total is not None:
+        missing = [i for i, row in enumerate(player_rows) if row.score is None or row.score <= MAX_STAT]
+        known = sum(row.score for row in player_rows if row.score is not None and row.score > MAX_STAT)
+        if len(missing) == 1 and total - known > MAX_STAT:
+            row = player_rows[missing[0]]
+            row.set_field(len(row.stats), total - known, None)
+            _correct_row(row, row_cells[missing[0]])
+            corrected.add(id(row))
+        elif not missing and known != total:
+            print(f"[WARN] Scores sum to {known:,} but Total match reads {total:,}")
+    return len(corrected)
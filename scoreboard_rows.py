@@ -0,0 +1,95 @@
+STAT_NAMES = ("Goal", "Assist", "Pass", "Interception", "Save", "Score")
+
+def parse_stat(text):
+    # "8,750" -> 8750; anything that is not a plain number -> None
+    text = str(text).replace(",", "").strip()
+    return int(text) if text.isdigit() else None
+
+class PlayerRow:
+    """
+    One parsed player: stats are ints (None when unreadable), parsed once when the row
+    is built. conf holds the OCR confidence of the name and of each stat, in that order,
+    or None where it is unknown; boxes likewise holds where each field was read.
+    """
+
+    __slots__ = ("name", "stats", "is_mvp", "team", "conf", "boxes")
+
+    def __init__(self, name, stats, is_mvp=False, team="", conf=None, boxes=None):
+        self.name = name
+        self.stats = tuple(stats)
+        self.is_mvp = is_mvp
+        self.team = team
+        self.conf = tuple(conf) if conf is not None else (None,) * (len(self.stats) + 1)
+        self.boxes = tuple(boxes) if boxes is not None else (None,) * (len(self.stats) + 1)
+
+    @classmethod
+    def from_cells(cls, name, cells, is_mvp=False, team="", conf=None, boxes=None):
+        return cls(name, (parse_stat(c) for c in cells), is_mvp, team, conf, boxes)
+
+    def field(self, index):
+        # Field 0 is the name, 1.. are the stats
+        return self.name if index == 0 else self.stats[index - 1]
+
+    def set_field(self, index, value, conf):
+        if index == 0:
+            self.name = value
+        else:
+            self.stats = self.stats[:index - 1] + (value,) + self.stats[index:]
+        self.conf = self.conf[:index] + (conf,) + self.conf[index + 1:]
+
+    @property
+    def score(self):
+        return self.stats[-1]
+
+    @property
+    def filled(self):
+        # Stats read as numbers, not counting Score
+        return sum(s is not None for s in self.stats[:-1])
+
+    @property
+    def complete(self):
+        return self.filled == len(self.stats) - 1
+
+    def values(self):
+        # [name, *stats, is_mvp] with ints and None, for typed sinks (csv writes None as "")
+        return [self.name, *self.stats, self.is_mvp]
+
+    def cells(self):
+        # The legacy [name, *stats, is_mvp] list, for CSV output and printing
+        return [self.name] + ["" if s is None else str(s) for s in self.stats] + [self.is_mvp]
+
+    def to_dict(self):
+        return {"team": self.team, "name": self.name,
+                **{stat: value for stat, value in zip(STAT_NAMES, self.stats)},
+                "is_mvp": self.is_mvp, "conf": list(self.conf)}
+
+    def __repr__(self):
+        return f"PlayerRow({self.cells()!r})"
+
+class MatchResult:
+    """
+    Parsed rows of one screenshot per team. Indexing and iteration work like the
+    {"HOME": rows, "AWAY": rows} dict it replaces.
+    """
+
+    __slots__ = ("source", "teams")
+
+    def __init__(self, teams, source=""):
+        self.teams = teams
+        self.source = source
+        for team, rows in teams.items():
+            for row in rows:
+                row.team = team
+
+    def __getitem__(self, team):
+        return self.teams[team]
+
+    def __iter__(self):
+        return iter(self.teams)
+
+    def rows(self):
+        for rows in self.teams.values():
+            yield from rows
+
+    def to_dict(self):
+        return {team: [row.to_dict() for row in rows] for team, rows in self.teams.items()}
@@ -0,0 +1,132 @@
+# Character whitelists shared by every backend
+NAME_WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_ "
+DIGIT_WHITELIST = "0123456789"
+
+PSM_SINGLE_BLOCK = 6
+PSM_SINGLE_LINE = 7
+
+# Blank rows/columns between crops stacked into one composite image
+STACK_GAP = 12
+
+def tesseract_config(whitelist, psm=PSM_SINGLE_LINE):
+    return f"--psm {psm} -c tessedit_char_whitelist={whitelist}"
+
+class PytesseractBackend:
+    """
+    The original path: one tesseract subprocess per call.
+    """
+    name = "pytesseract"
+
+    def __init__(self):
+        # Imported on construction, like tesserocr, so listing BACKENDS stays cheap
+        try:
+            import pytesseract
+        except ImportError:
+            raise ImportError("The pytesseract backend needs 'pip install pytesseract'")
+        self._pytesseract = pytesseract
+
+    def recognize(self, image, whitelist, psm=PSM_SINGLE_LINE):
+        return self._pytesseract.image_to_string(image, config=tesseract_config(whitelist, psm)).strip()
+
+    def recognize_words(self, image, whitelist, psm=PSM_SINGLE_BLOCK):
+        # Returns [(text, left, top, height), ...] for every recognized word
+        data = self._pytesseract.image_to_data(image, config=tesseract_config(whitelist, psm),
+                                               output_type=self._pytesseract.Output.DICT)
+        words = []
+        for text, left, top, height in zip(data["text"], data["left"], data["top"], data["height"]):
+            if text.strip():
+                words.append((text.strip(), left, top, height))
+        return words
+
+    def close(self):
+        pass
+
+class TesserocrBackend:
+    """
+    Keeps one in-process Tesseract handle per (whitelist, psm) alive for the whole run
+    and feeds it numpy crops directly, with no subprocess or temp files.
+    """
+    name = "tesserocr"
+
+    def __init__(self, lang="eng"):
+        try:
+            import tesserocr
+        except ImportError:
+            raise ImportError("The tesserocr backend needs 'pip install tesserocr'")
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self._apis = {}
+
+    def _api(self, whitelist, psm):
+        key = (whitelist, psm)
+        api = self._apis.get(key)
+        if api is None:
+            api = self._tesserocr.PyTessBaseAPI(lang=self.lang, psm=psm)
+            api.SetVariable("tessedit_char_whitelist", whitelist)
+            self._apis[key] = api
+        return api
+
+    def _set_image(self, api, image):
+        import numpy as np
+        image = np.ascontiguousarray(image)
+        height, width = image.shape[:2]
+        bytes_per_pixel = 1 if image.ndim == 2 else image.shape[2]
+        api.SetImageBytes(image.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+
+    def recognize(self, image, whitelist, psm=PSM_SINGLE_LINE):
+        api = self._api(whitelist, psm)
+        self._set_image(api, image)
+        return api.GetUTF8Text().strip()
+
+    def recognize_words(self, image, whitelist, psm=PSM_SINGLE_BLOCK):
+        api = self._api(whitelist, psm)
+        self._set_image(api, image)
+        api.Recognize()
+        level = self._tesserocr.RIL.WORD
+        words = []
+        for r in self._tesserocr.iterate_level(api.GetIterator(), level):
+            text = (r.GetUTF8Text(level) or "").strip()
+            if text:
+                x0, y0, x1, y1 = r.BoundingBox(level)
+                words.append((text, x0, y0, y1 - y0))
+        return words
+
+    def close(self):
+        for api in self._apis.values():
+            api.End()
+        self._apis = {}
+
+def stack_crops(crops, gap=STACK_GAP):
+    """
+    Stacks equally wide crops vertically into one composite, padded with the dominant
+    background value. Returns (composite, slot_height); crop i starts at gap + i * slot_height.
+    """
+    import numpy as np
+    height = max(c.shape[0] for c in crops)
+    width = max(c.shape[1] for c in crops)
+    background = int(np.median(np.concatenate([c.ravel() for c in crops])))
+    slot_height = height + gap
+    composite = np.full((gap + len(crops) * slot_height, width + 2 * gap), background, dtype=crops[0].dtype)
+    for i, crop in enumerate(crops):
+        y = gap + i * slot_height
+        composite[y:y + crop.shape[0], gap:gap + crop.shape[1]] = crop
+    return composite, slot_height
+
+def split_words_by_slot(words, num_slots, slot_height, gap=STACK_GAP):
+    # Routes word boxes from a stacked composite back to their crop by vertical centre
+    slots = [[] for _ in range(num_slots)]
+    for text, left, top, height in words:
+        idx = (top + height // 2 - gap) // slot_height
+        if 0 <= idx < num_slots:
+            slots[idx].append((left, text))
+    return [" ".join(text for _, text in sorted(slot)) for slot in slots]
+
+BACKENDS = {
+    "pytesseract": PytesseractBackend,
+    "tesserocr": TesserocrBackend,
+}
+
+def get_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
@@ -0,0 +1,46 @@
+import os
+import time
+
+from image_batch import is_image_file
+
+DEFAULT_POLL_SECONDS = 0.5
+
+def scan(directory):
+    # {path: (size, mtime)} for every screenshot currently in directory
+    found = {}
+    for entry in os.scandir(directory):
+        if entry.is_file() and is_image_file(entry.path):
+            st = entry.stat()
+            found[entry.path] = (st.st_size, st.st_mtime)
+    return found
+
+def watch_folder(directory, handle, poll=DEFAULT_POLL_SECONDS, skip=()):
+    """
+    Polls directory and calls handle(path) once for every new or replaced screenshot,
+    oldest first. A file is only handed over once its size and mtime are unchanged
+    between two polls, so half-copied uploads are not parsed. Paths in skip count as
+    already handled in the version on disk at startup; a later change of size or mtime
+    (or a file that only appears later) is parsed again. Runs until interrupted.
+    """
+    skip = set(skip)
+    done = {path: stat for path, stat in scan(directory).items() if path in skip}
+    pending = {}
+    while True:
+        current = scan(directory)
+        for path in list(pending):
+            if path not in current:
+                del pending[path]
+        for path, stat in sorted(current.items(), key=lambda item: item[1][1]):
+            if done.get(path) == stat:
+                continue
+            if pending.get(path) != stat:
+                pending[path] = stat
+                continue
+            del pending[path]
+            done[path] = stat
+            try:
+                handle(path)
+            except Exception as e:
+                # One unreadable screenshot must not take the daemon down
+                print(f"[WARN] Failed to parse {path}: {e}")
+        time.sleep(poll)